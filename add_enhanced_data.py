@@ -5,7 +5,6 @@ Add hero images, gallery photos, and multimedia to parks and species
 from sqlmodel import Session, select
 from database import engine
 from models import ParkDB, SpeciesDB
-import json
 
 def add_enhanced_data():
     print("=== ADDING ENHANCED DATA ===\n")
@@ -40,11 +39,11 @@ def add_enhanced_data():
         parks = session.exec(select(ParkDB)).all()
         for park in parks:
             for key, data in park_images.items():
-                if key in park.park_name:
+                if key in park.name:
                     park.hero_image_url = data["hero"]
-                    park.gallery_images = json.dumps(data["gallery"])
+                    park.gallery_images = data["gallery"]
                     session.add(park)
-                    print(f"  ✅ {park.park_name}")
+                    print(f"  ✅ {park.name}")
                     break
         
         session.commit()
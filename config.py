@@ -1,5 +1,6 @@
 from typing import List
 
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -8,25 +9,72 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    # How long a verified token is trusted without re-checking its signature
+    TOKEN_CACHE_TTL: int = 10
 
     # Admin Credentials (dev only; later move to DB)
+    # Set ADMIN_PASSWORD_HASH (a passlib hash) to avoid keeping the
+    # plaintext password in the environment; ADMIN_PASSWORD is the fallback.
     ADMIN_USERNAME: str
-    ADMIN_PASSWORD: str
+    ADMIN_PASSWORD: str | None = None
+    ADMIN_PASSWORD_HASH: str | None = None
     ADMIN_FULL_NAME: str = "Park Admin"
 
     # Database
     DATABASE_URL: str = "sqlite:///./tunisia_parks.db"
+    # Each worker may open up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections;
+    # keep workers * (pool + overflow) below the server's max_connections,
+    # or point DATABASE_URL at PgBouncer (transaction mode) to multiplex them.
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 3600  # seconds before a pooled connection is replaced
+    DB_STATEMENT_TIMEOUT_MS: int = 5000  # PostgreSQL only
+    # SQLite only: switch to write-ahead logging so reads don't block on writes
+    DB_SQLITE_WAL: bool = True
+    # Run create_all at startup; disable once the schema is managed by Alembic
+    DB_AUTO_CREATE: bool = True
+
+    # Worker threads for sync endpoints (AnyIO defaults to 40); keep it in
+    # line with DB_POOL_SIZE + DB_MAX_OVERFLOW so threads never wait on the pool
+    THREADPOOL_SIZE: int = 60
+
+    # In-process cache for park reference data (seconds)
+    PARK_CACHE_TTL: int = 120
+
+    # Seconds a successful /health database probe is reused, so frequent
+    # load-balancer checks don't each take a pool connection
+    HEALTH_CACHE_TTL: float = 5.0
+
+    # Log one line per request (method, path, status, duration)
+    ACCESS_LOG: bool = True
+
+    # Rate limit counters: "memory://" is per process; point this at Redis
+    # (e.g. redis://localhost:6379/1) so all workers share one limit
+    RATE_LIMIT_STORAGE_URI: str = "memory://"
+
+    # gzip level for compressed responses: 5 is far cheaper than the
+    # default 9 for nearly the same ratio on JSON
+    GZIP_COMPRESS_LEVEL: int = 5
 
     # CORS
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://localhost:8080,http://127.0.0.1:3000"
 
     # Weather API
     OPENWEATHER_API_KEY: str | None = None
+    WEATHER_CACHE_TTL: int = 600  # seconds
+    FORECAST_CACHE_TTL: int = 3600  # seconds
 
     class Config:
         env_file = ".env"
         case_sensitive = True
 
+    @model_validator(mode="after")
+    def check_admin_credentials(self) -> "Settings":
+        if not self.ADMIN_PASSWORD and not self.ADMIN_PASSWORD_HASH:
+            raise ValueError("Either ADMIN_PASSWORD or ADMIN_PASSWORD_HASH must be set")
+        return self
+
     def get_origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",") if origin.strip()]
 
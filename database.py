@@ -1,9 +1,42 @@
+import logging
+
+from sqlalchemy import event, func, inspect, select
 from sqlmodel import SQLModel, create_engine, Session
 from config import settings
 
+logger = logging.getLogger(__name__)
+
+
+connect_args = {}
+if settings.DATABASE_URL.startswith("postgresql"):
+    # Abort runaway queries server-side instead of tying up a pooled connection
+    connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
 
 # Echo=False in production to avoid logging SQL; keep True while developing if you like
-engine = create_engine(settings.DATABASE_URL, echo=True)
+engine = create_engine(
+    settings.DATABASE_URL,
+    echo=True,
+    # Sized so every request handled through get_db() can hold a pooled
+    # connection for its whole lifetime under concurrent load.
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    # Retire connections before server/proxy idle timeouts close them
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    # Replace connections dropped by the server before handing them out
+    pool_pre_ping=True,
+    connect_args=connect_args,
+)
+
+if settings.DATABASE_URL.startswith("sqlite") and settings.DB_SQLITE_WAL:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL lets readers proceed while a write is in progress; NORMAL sync
+        # is durable enough in WAL mode and avoids an fsync per commit.
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
 
 
 def init_db() -> None:
@@ -24,6 +57,51 @@ def init_db() -> None:
 
     SQLModel.metadata.create_all(engine)
 
+    # create_all skips tables that already exist, so indexes added to the
+    # models later would never reach an existing database otherwise.
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+    _upgrade_unique_indexes()
+
+
+def _upgrade_unique_indexes() -> None:
+    """
+    Rebuild indexes that the models now declare unique (e.g. ix_parks_name)
+    but that an older database still has as plain indexes.
+
+    The index is only rebuilt when the existing rows contain no duplicates;
+    otherwise a warning is logged and the old index is left in place.
+    """
+    inspector = inspect(engine)
+    for table in SQLModel.metadata.sorted_tables:
+        unique_indexes = [index for index in table.indexes if index.unique]
+        if not unique_indexes:
+            continue
+        existing = {ix["name"]: ix for ix in inspector.get_indexes(table.name)}
+        for index in unique_indexes:
+            current = existing.get(index.name)
+            if current is None or current["unique"]:
+                continue
+
+            columns = list(index.columns)
+            with engine.begin() as conn:
+                duplicates = conn.execute(
+                    select(*columns).group_by(*columns).having(func.count() > 1).limit(5)
+                ).all()
+                if duplicates:
+                    logger.warning(
+                        "Cannot make %s unique: duplicate values %s in %s",
+                        index.name,
+                        [tuple(row) for row in duplicates],
+                        table.name,
+                    )
+                    continue
+                index.drop(conn)
+                index.create(conn)
+                logger.info("Rebuilt %s as a unique index", index.name)
+
 
 def get_db():
     """FastAPI dependency that provides a database session."""
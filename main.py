@@ -1,7 +1,16 @@
 from typing import List, Literal
 from datetime import datetime, timedelta, timezone
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 
+import asyncio
+import atexit
+import hashlib
 import logging
+import math
+import queue
+import threading
 import time
 import json
 
@@ -17,22 +26,30 @@ from fastapi import (
 )
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import JSONResponse, HTMLResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
+from anyio import to_thread
 from pydantic import BaseModel, Field
-from sqlmodel import Session, select
-from jose import JWTError, jwt
+from pydantic_core import to_json
+from sqlalchemy import and_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased, load_only
+from sqlmodel import Session, delete, func, insert, select
+import jwt
+from jwt.exceptions import InvalidTokenError
 from passlib.context import CryptContext
+from cachetools import TLRUCache, TTLCache
 
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 from slowapi.middleware import SlowAPIASGIMiddleware
 
-from database import init_db, engine
+from database import init_db, get_db
 from models import (
     ParkDB,
     SpeciesDB,
@@ -49,12 +66,28 @@ from utils import (
     get_file_url,
     PARKS_DIR,
     SPECIES_DIR,
+    PARKS_URL_PREFIX,
+    SPECIES_URL_PREFIX,
 )
-from weather_service import get_weather_for_location, get_weather_forecast
+from weather_service import close_http_client, get_weather_for_location, get_weather_forecast
 
 
 # ---------- APP & GLOBAL MIDDLEWARE ----------
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Sync DB endpoints run in AnyIO's worker threads; the default limit of
+    # 40 would cap concurrency below what the connection pool can serve.
+    to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+
+    # create_all introspects every table; with Alembic-managed schemas set
+    # DB_AUTO_CREATE=false to skip it. When it does run, keep the event loop free.
+    if settings.DB_AUTO_CREATE:
+        await to_thread.run_sync(init_db)
+    yield
+    await close_http_client()
+
+
 app = FastAPI(
     title="Tunisia National Parks API - Enhanced Edition",
     description="""
@@ -79,6 +112,7 @@ app = FastAPI(
     * **Emergency**: Report emergencies with location data
     """,
     version="3.0.0",
+    lifespan=lifespan,
 )
 
 # CORS
@@ -86,40 +120,75 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.get_origins_list(),
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Explicit lists let Starlette precompute preflight headers instead of
+    # echoing back whatever each request asks for.
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["Authorization", "Content-Type"],
+    # Let browsers reuse a preflight result for a day
+    max_age=86400,
+)
+
+# Compress JSON listings; tiny bodies such as /api/health are not worth it
+app.add_middleware(
+    GZipMiddleware, minimum_size=1024, compresslevel=settings.GZIP_COMPRESS_LEVEL
 )
 
 # Global rate limiting
-limiter = Limiter(key_func=get_remote_address, default_limits=["60/minute"])
+limiter = Limiter(
+    key_func=get_remote_address,
+    default_limits=["60/minute"],
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 app.add_middleware(SlowAPIASGIMiddleware)
 
-# Logging
+# Logging: callers only enqueue records; formatting and stream I/O happen
+# on the QueueListener's background thread.
 logger = logging.getLogger("tunisia_parks")
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(name)s - %(message)s",
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(
+    logging.Formatter("%(asctime)s - %(levelname)s - %(name)s - %(message)s")
 )
+_log_listener = QueueListener(_log_queue, _log_stream_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+# The queue handler only passes the message through; the listener's handler
+# applies the real format (basicConfig would add a second prefix).
+_log_queue_handler = QueueHandler(_log_queue)
+_log_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+logging.getLogger().addHandler(_log_queue_handler)
+logging.getLogger().setLevel(logging.INFO)
 
 # Static files and templates
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 templates = Jinja2Templates(directory="templates")
 
 
-@app.middleware("http")
 async def log_requests(request: Request, call_next):
-    start_time = time.time()
+    if not logger.isEnabledFor(logging.INFO):
+        return await call_next(request)
+
+    start_time = time.perf_counter()
     response = await call_next(request)
-    process_ms = (time.time() - start_time) * 1000
+    process_ms = (time.perf_counter() - start_time) * 1000
+    # Lazy %-formatting: the message is only built if a handler emits it
     logger.info(
-        f"{request.method} {request.url.path} -> {response.status_code} "
-        f"({process_ms:.2f} ms)"
+        "%s %s -> %d (%.2f ms)",
+        request.method,
+        request.url.path,
+        response.status_code,
+        process_ms,
     )
     return response
 
 
+# Only pay for the middleware hop when access logging is wanted
+if settings.ACCESS_LOG:
+    app.middleware("http")(log_requests)
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     return JSONResponse(
@@ -147,11 +216,88 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
+# ---------- HTTP CACHING ----------
+
+# Park and map data is effectively static; let browsers/CDNs reuse it briefly
+CACHE_MAX_AGE = 300
+# Coordinates and names almost never change; shared caches may keep map data
+# for a day while browsers revalidate hourly against the ETag.
+MAP_CACHE_MAX_AGE = 3600
+MAP_CACHE_S_MAXAGE = 86400
+
+
+def cacheable_json_response(
+    request: Request,
+    content,
+    max_age: int = CACHE_MAX_AGE,
+    s_maxage: int | None = None,
+) -> Response:
+    """
+    Serialize content to JSON with Cache-Control and ETag headers.
+
+    Returns an empty 304 response when the client's If-None-Match
+    already matches the current body, and headers only for HEAD.
+    """
+    body = to_json(content)
+    etag = f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"'
+    cache_control = f"public, max-age={max_age}"
+    if s_maxage is not None:
+        cache_control += f", s-maxage={s_maxage}"
+    # Shared caches must keep gzip and identity variants apart
+    headers = {"Cache-Control": cache_control, "ETag": etag, "Vary": "Accept-Encoding"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    if request.method == "HEAD":
+        # No body, so GZipMiddleware passes it straight through
+        headers["Content-Length"] = str(len(body))
+        return Response(media_type="application/json", headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Reference data derived from the parks table (park list, governorates, map
+# markers) is kept in-process for PARK_CACHE_TTL seconds and dropped on any park write.
+_park_cache: TTLCache = TTLCache(maxsize=64, ttl=settings.PARK_CACHE_TTL)
+_park_cache_lock = threading.Lock()
+
+
+def get_cached_park_data(key: str):
+    with _park_cache_lock:
+        return _park_cache.get(key)
+
+
+def set_cached_park_data(key: str, value) -> None:
+    with _park_cache_lock:
+        _park_cache[key] = value
+
+
+def invalidate_park_cache() -> None:
+    with _park_cache_lock:
+        _park_cache.clear()
+
+
 # ---------- SECURITY CONFIG ----------
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# New hashes use argon2 (OWASP minimum parameters); existing pbkdf2_sha256
+# hashes, e.g. an older ADMIN_PASSWORD_HASH, still verify.
+pwd_context = CryptContext(
+    schemes=["argon2", "pbkdf2_sha256"],
+    deprecated="auto",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1,
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
+# JWT parameters are fixed for the process lifetime; read them once.
+_JWT_KEY = settings.SECRET_KEY
+_JWT_ALGORITHM = settings.ALGORITHM
+_JWT_ALGORITHMS = [settings.ALGORITHM]
+_ACCESS_TOKEN_TTL = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
 
 class Token(BaseModel):
     access_token: str
@@ -180,18 +326,29 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-fake_admin_user_db: dict[str, UserInDB] = {
-    settings.ADMIN_USERNAME: UserInDB(
-        username=settings.ADMIN_USERNAME,
-        full_name=settings.ADMIN_FULL_NAME,
-        disabled=False,
-        hashed_password=get_password_hash(settings.ADMIN_PASSWORD),
+@lru_cache(maxsize=1)
+def get_admin_user_db() -> dict[str, UserInDB]:
+    """
+    Build the admin user store on first use rather than at import time.
+
+    Uses ADMIN_PASSWORD_HASH as-is when configured; otherwise hashes
+    ADMIN_PASSWORD once, so the KDF never runs during worker start-up.
+    """
+    hashed_password = settings.ADMIN_PASSWORD_HASH or get_password_hash(
+        settings.ADMIN_PASSWORD
     )
-}
+    return {
+        settings.ADMIN_USERNAME: UserInDB(
+            username=settings.ADMIN_USERNAME,
+            full_name=settings.ADMIN_FULL_NAME,
+            disabled=False,
+            hashed_password=hashed_password,
+        )
+    }
 
 
 def get_user(username: str) -> UserInDB | None:
-    return fake_admin_user_db.get(username)
+    return get_admin_user_db().get(username)
 
 
 def authenticate_user(username: str, password: str) -> UserInDB | None:
@@ -205,46 +362,69 @@ def authenticate_user(username: str, password: str) -> UserInDB | None:
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + (
-        expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    )
+    expire = datetime.now(timezone.utc) + (expires_delta or _ACCESS_TOKEN_TTL)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _JWT_KEY, algorithm=_JWT_ALGORITHM)
     return encoded_jwt
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
-    credentials_exception = HTTPException(
+# Verified tokens -> (user, exp timestamp). Entries live for TOKEN_CACHE_TTL
+# seconds but never past the token's own expiry. Keys are digests so raw
+# tokens are never held in memory longer than the request.
+_token_cache: TLRUCache = TLRUCache(
+    maxsize=10000,
+    ttu=lambda _key, value, now: min(now + settings.TOKEN_CACHE_TTL, value[1]),
+    timer=time.time,
+)
+
+
+def credentials_exception() -> HTTPException:
+    # Built only on failure, and fresh each time: a shared module-level
+    # instance would keep accumulating tracebacks across requests.
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
     )
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    cached = _token_cache.get(cache_key)
+    if cached is not None:
+        return cached[0]
+
     try:
+        # Tokens without exp are rejected: they would never expire, and the
+        # cache entry below is bounded by exp
         payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            token, _JWT_KEY, algorithms=_JWT_ALGORITHMS, options={"require": ["exp"]}
         )
         username: str | None = payload.get("sub")
         if username is None:
-            raise credentials_exception
+            raise credentials_exception()
         token_data = TokenData(username=username)
-    except JWTError:
-        raise credentials_exception
+    except InvalidTokenError:
+        raise credentials_exception()
 
     user = get_user(token_data.username)
     if user is None or user.disabled:
-        raise credentials_exception
+        raise credentials_exception()
+
+    _token_cache[cache_key] = (user, payload["exp"])
     return user
 
 
-# ---------- STARTUP & HEALTH ----------
+# ---------- HEALTH ----------
 
-@app.on_event("startup")
-def on_startup():
-    init_db()
+# Health checks are polled by load balancers; serve a pre-serialized body
+# without validation, JSON encoding, threadpool hop or rate limiting.
+_HEALTH_BODY = json.dumps({"status": "ok", "version": app.version}).encode()
 
 
 @app.get("/api/health", tags=["Health"])
-def health_check():
-    return {"status": "ok", "version": "3.0.0"}
+@limiter.exempt
+async def health_check():
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 @app.post("/auth/token", response_model=Token, tags=["Authentication"])
@@ -294,6 +474,89 @@ class ParkUpdate(BaseModel):
     area_km2: float | None = Field(default=None, gt=0)
 
 
+# The *_to_schema converters build response models with model_construct:
+# rows come straight from the database, so validation is skipped.
+def park_to_schema(park: ParkDB) -> Park:
+    """Convert a ParkDB row into the public Park response model."""
+    return Park.model_construct(
+        id=park.id,
+        name=park.name,
+        governorate=park.governorate,
+        description=park.description,
+        latitude=park.latitude,
+        longitude=park.longitude,
+        area_km2=park.area_km2,
+        images=[PARKS_URL_PREFIX + img for img in park.images or ()],
+    )
+
+
+def existing_park_ids(session: Session, park_ids) -> set[int]:
+    """Return the subset of park_ids that exist, in a single IN query."""
+    if not park_ids:
+        return set()
+    return set(session.exec(select(ParkDB.id).where(ParkDB.id.in_(park_ids))).all())
+
+
+def ensure_park_exists(session: Session, park_id: int) -> None:
+    """Raise a 404 unless the park exists, without loading the full row."""
+    if session.exec(select(ParkDB.id).where(ParkDB.id == park_id)).first() is None:
+        raise HTTPException(status_code=404, detail="Park not found")
+
+
+def ensure_park_name_available(session: Session, name: str, park_id: int | None = None) -> None:
+    """Raise a 409 if another park already uses this name (served by the name index)."""
+    statement = select(ParkDB.id).where(ParkDB.name == name)
+    if park_id is not None:
+        statement = statement.where(ParkDB.id != park_id)
+    if session.exec(statement).first() is not None:
+        raise HTTPException(status_code=409, detail="A park with this name already exists")
+
+
+def commit_park(session: Session) -> None:
+    """
+    Commit a park write, mapping a unique-name violation to a 409.
+
+    ensure_park_name_available gives the friendly error up front; the unique
+    index still decides when two writers race past that check.
+    """
+    try:
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        raise HTTPException(status_code=409, detail="A park with this name already exists")
+
+
+def get_park_location(session: Session, park_id: int):
+    """Fetch only the identity, coordinates and map URL of a park, or raise a 404."""
+    park = session.exec(
+        select(
+            ParkDB.id,
+            ParkDB.name,
+            ParkDB.latitude,
+            ParkDB.longitude,
+            ParkDB.governorate,
+            ParkDB.google_maps_url,
+        ).where(ParkDB.id == park_id)
+    ).first()
+    if park is None:
+        raise HTTPException(status_code=404, detail="Park not found")
+    return park
+
+
+def read_then_release(session: Session, read, *args):
+    """
+    Run a read against the session, then close it.
+
+    Used by async handlers so the pooled connection goes back to the pool
+    before they await slow network I/O such as the weather provider.
+    Results must be plain rows, not ORM objects (those would be detached).
+    """
+    try:
+        return read(session, *args)
+    finally:
+        session.close()
+
+
 # ---------- SPECIES MODELS ----------
 
 class Species(BaseModel):
@@ -336,6 +599,67 @@ class SpeciesUpdate(BaseModel):
     park_ids: List[int] | None = None
 
 
+# The columns species_to_schema reads; the multimedia and detail columns are
+# never loaded for API responses (and list joins repeat each row per link).
+SPECIES_SCHEMA_COLUMNS = load_only(
+    SpeciesDB.species_id,
+    SpeciesDB.name,
+    SpeciesDB.type,
+    SpeciesDB.scientific_name,
+    SpeciesDB.description,
+    SpeciesDB.threats,
+    SpeciesDB.protection_measures,
+    SpeciesDB.safety_guidelines,
+    SpeciesDB.medicinal_use,
+    SpeciesDB.image_url,
+)
+
+
+def species_to_schema(species: SpeciesDB, park_ids: List[int]) -> Species:
+    """Convert a SpeciesDB row (plus its linked park ids) into the Species response model."""
+    return Species.model_construct(
+        id=species.species_id,
+        name=species.name,
+        type=species.type,
+        scientific_name=species.scientific_name,
+        description=species.description,
+        threats=species.threats or "",
+        protection_measures=species.protection_measures or "",
+        safety_guidelines=species.safety_guidelines or "",
+        medicinal_use=species.medicinal_use,
+        image_url=SPECIES_URL_PREFIX + species.image_url if species.image_url else None,
+        park_ids=park_ids,
+    )
+
+
+def add_species_links(session: Session, species_id: int, park_ids) -> None:
+    """
+    Link a species to parks with one executemany INSERT.
+
+    Link rows are never read back in the same request, so they skip ORM
+    object construction and identity-map tracking.
+    """
+    if park_ids:
+        session.execute(
+            insert(ParkSpeciesLink),
+            [{"park_id": park_id, "species_id": species_id} for park_id in park_ids],
+        )
+
+
+def species_rows_to_schema(rows) -> List[Species]:
+    """
+    Group (SpeciesDB, park_id) rows from a species/link join into Species models.
+
+    park_id is None for species without any park (outer joins).
+    """
+    grouped: dict[int, tuple[SpeciesDB, List[int]]] = {}
+    for species, park_id in rows:
+        entry = grouped.setdefault(species.species_id, (species, []))
+        if park_id is not None:
+            entry[1].append(park_id)
+    return [species_to_schema(s, park_ids) for s, park_ids in grouped.values()]
+
+
 # ---------- ENHANCED FEATURE MODELS ----------
 
 class Trail(BaseModel):
@@ -393,6 +717,22 @@ class TrailUpdate(BaseModel):
     trail_type: str | None = None
     highlights: List[str] | None = None
 
+
+def trail_to_schema(trail: TrailDB) -> Trail:
+    """Convert a TrailDB row into the Trail response model."""
+    return Trail.model_construct(
+        trail_id=trail.trail_id,
+        park_id=trail.park_id,
+        name=trail.name,
+        description=trail.description,
+        difficulty=trail.difficulty,
+        length_km=trail.length_km,
+        duration_hours=trail.duration_hours,
+        elevation_gain=trail.elevation_gain,
+        trail_type=trail.trail_type,
+        highlights=trail.highlights or [],
+    )
+
 class Sighting(BaseModel):
     sighting_id: int
     park_id: int
@@ -472,6 +812,16 @@ class MapData(BaseModel):
     directions_url: str
 
 
+class NearbyPark(BaseModel):
+    park_id: int
+    park_name: str
+    latitude: float
+    longitude: float
+    governorate: str
+    google_maps_url: str
+    distance_km: float
+
+
 class DirectionsRequest(BaseModel):
     origin_lat: float
     origin_lng: float
@@ -511,74 +861,51 @@ class MultiParkRouteResponse(BaseModel):
 
 @app.get("/api/parks", response_model=List[Park], tags=["Parks"])
 def list_parks(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    session: Session = Depends(get_db),
 ):
-    with Session(engine) as session:
+    cache_key = f"parks:{skip}:{limit}"
+    parks = get_cached_park_data(cache_key)
+    if parks is None:
         statement = select(ParkDB).offset(skip).limit(limit)
-        parks_db = session.exec(statement).all()
-        return [
-            Park(
-                id=p.id,
-                name=p.name,
-                governorate=p.governorate,
-                description=p.description,
-                latitude=p.latitude,
-                longitude=p.longitude,
-                area_km2=p.area_km2,
-                images=[get_file_url(img, "parks") for img in (p.images or [])],
-            )
-            for p in parks_db
-        ]
+        parks = [park_to_schema(p) for p in session.exec(statement).all()]
+        set_cached_park_data(cache_key, parks)
+    return cacheable_json_response(request, parks)
 
 
 @app.get("/api/parks/{park_id}", response_model=Park, tags=["Parks"])
-def get_park(park_id: int):
-    with Session(engine) as session:
-        park = session.get(ParkDB, park_id)
-        if park is None:
-            raise HTTPException(status_code=404, detail="Park not found")
-
-        return Park(
-            id=park.id,
-            name=park.name,
-            governorate=park.governorate,
-            description=park.description,
-            latitude=park.latitude,
-            longitude=park.longitude,
-            area_km2=park.area_km2,
-            images=[get_file_url(img, "parks") for img in (park.images or [])],
-        )
+def get_park(request: Request, park_id: int, session: Session = Depends(get_db)):
+    park = session.get(ParkDB, park_id)
+    if park is None:
+        raise HTTPException(status_code=404, detail="Park not found")
+
+    return cacheable_json_response(request, park_to_schema(park))
 
 
 @app.post("/api/parks", response_model=Park, status_code=201, tags=["Parks"])
 def create_park(
     park_in: ParkCreate,
     current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_db),
 ):
-    with Session(engine) as session:
-        park_db = ParkDB(
-            name=park_in.name,
-            governorate=park_in.governorate,
-            description=park_in.description,
-            latitude=park_in.latitude,
-            longitude=park_in.longitude,
-            area_km2=park_in.area_km2,
-        )
-        session.add(park_db)
-        session.commit()
-        session.refresh(park_db)
-
-        return Park(
-            id=park_db.id,
-            name=park_db.name,
-            governorate=park_db.governorate,
-            description=park_db.description,
-            latitude=park_db.latitude,
-            longitude=park_db.longitude,
-            area_km2=park_db.area_km2,
-            images=[],
-        )
+    ensure_park_name_available(session, park_in.name)
+    park_db = ParkDB(
+        name=park_in.name,
+        governorate=park_in.governorate,
+        description=park_in.description,
+        latitude=park_in.latitude,
+        longitude=park_in.longitude,
+        area_km2=park_in.area_km2,
+        google_maps_url=_maps_url(park_in.latitude, park_in.longitude),
+    )
+    session.add(park_db)
+    commit_park(session)
+    session.refresh(park_db)
+    invalidate_park_cache()
+
+    return park_to_schema(park_db)
 
 
 @app.put("/api/parks/{park_id}", response_model=Park, tags=["Parks"])
@@ -586,49 +913,73 @@ def update_park(
     park_id: int,
     park_in: ParkUpdate,
     current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_db),
 ):
-    with Session(engine) as session:
-        park_db = session.get(ParkDB, park_id)
-        if park_db is None:
-            raise HTTPException(status_code=404, detail="Park not found")
+    park_db = session.get(ParkDB, park_id)
+    if park_db is None:
+        raise HTTPException(status_code=404, detail="Park not found")
 
-        data = park_in.model_dump(exclude_unset=True)
-        for field, value in data.items():
-            setattr(park_db, field, value)
+    data = park_in.model_dump(exclude_unset=True)
+    if "name" in data:
+        ensure_park_name_available(session, data["name"], park_id)
+    for field, value in data.items():
+        setattr(park_db, field, value)
+    if "latitude" in data or "longitude" in data:
+        park_db.google_maps_url = _maps_url(park_db.latitude, park_db.longitude)
 
-        session.add(park_db)
-        session.commit()
-        session.refresh(park_db)
-
-        return Park(
-            id=park_db.id,
-            name=park_db.name,
-            governorate=park_db.governorate,
-            description=park_db.description,
-            latitude=park_db.latitude,
-            longitude=park_db.longitude,
-            area_km2=park_db.area_km2,
-            images=[get_file_url(img, "parks") for img in (park_db.images or [])],
-        )
+    session.add(park_db)
+    commit_park(session)
+    session.refresh(park_db)
+    invalidate_park_cache()
+
+    return park_to_schema(park_db)
 
 
 @app.delete("/api/parks/{park_id}", status_code=204, tags=["Parks"])
 def delete_park(
     park_id: int,
     current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_db),
 ):
-    with Session(engine) as session:
-        park_db = session.get(ParkDB, park_id)
-        if park_db is None:
-            raise HTTPException(status_code=404, detail="Park not found")
-
-        if park_db.images:
-            for img_filename in park_db.images:
-                delete_file(img_filename, PARKS_DIR)
-
-        session.delete(park_db)
-        session.commit()
-        return None
+    park_db = session.get(ParkDB, park_id)
+    if park_db is None:
+        raise HTTPException(status_code=404, detail="Park not found")
+
+    if park_db.images:
+        for img_filename in park_db.images:
+            delete_file(img_filename, PARKS_DIR)
+
+    # Drop the park's species links in one statement (the FK cascade is not
+    # enforced on SQLite or on tables created before it was declared)
+    session.exec(delete(ParkSpeciesLink).where(ParkSpeciesLink.park_id == park_id))
+    session.delete(park_db)
+    session.commit()
+    invalidate_park_cache()
+    return None
+
+
+@app.get("/api/governorates", tags=["Parks"])
+def list_governorates(request: Request, session: Session = Depends(get_db)):
+    """List governorates that contain at least one park, with park counts."""
+    cached = get_cached_park_data("governorates")
+    if cached is not None:
+        return cacheable_json_response(request, cached)
+
+    rows = session.exec(
+        select(ParkDB.governorate, func.count(ParkDB.id))
+        .group_by(ParkDB.governorate)
+        .order_by(ParkDB.governorate)
+    ).all()
+
+    result = {
+        "total_governorates": len(rows),
+        "governorates": [
+            {"name": governorate, "park_count": park_count}
+            for governorate, park_count in rows
+        ],
+    }
+    set_cached_park_data("governorates", result)
+    return cacheable_json_response(request, result)
 
 
 # ---------- PARK IMAGE ENDPOINTS ----------
@@ -638,28 +989,29 @@ async def upload_park_image(
     park_id: int,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_db),
 ):
-    with Session(engine) as session:
-        park_db = session.get(ParkDB, park_id)
-        if park_db is None:
-            raise HTTPException(status_code=404, detail="Park not found")
+    park_db = session.get(ParkDB, park_id)
+    if park_db is None:
+        raise HTTPException(status_code=404, detail="Park not found")
 
-        filename = await save_upload_file(file, PARKS_DIR)
+    filename = await save_upload_file(file, PARKS_DIR)
 
-        if park_db.images is None:
-            park_db.images = []
-        park_db.images.append(filename)
+    if park_db.images is None:
+        park_db.images = []
+    park_db.images.append(filename)
 
-        session.add(park_db)
-        session.commit()
-        session.refresh(park_db)
+    session.add(park_db)
+    session.commit()
+    session.refresh(park_db)
+    invalidate_park_cache()
 
-        return {
-            "message": "Image uploaded successfully",
-            "filename": filename,
-            "url": get_file_url(filename, "parks"),
-            "total_images": len(park_db.images),
-        }
+    return {
+        "message": "Image uploaded successfully",
+        "filename": filename,
+        "url": get_file_url(filename, "parks"),
+        "total_images": len(park_db.images),
+    }
 
 
 @app.delete(
@@ -669,21 +1021,22 @@ def delete_park_image(
     park_id: int,
     filename: str,
     current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_db),
 ):
-    with Session(engine) as session:
-        park_db = session.get(ParkDB, park_id)
-        if park_db is None:
-            raise HTTPException(status_code=404, detail="Park not found")
+    park_db = session.get(ParkDB, park_id)
+    if park_db is None:
+        raise HTTPException(status_code=404, detail="Park not found")
 
-        if not park_db.images or filename not in park_db.images:
-            raise HTTPException(status_code=404, detail="Image not found")
+    if not park_db.images or filename not in park_db.images:
+        raise HTTPException(status_code=404, detail="Image not found")
 
-        park_db.images.remove(filename)
-        session.add(park_db)
-        session.commit()
+    park_db.images.remove(filename)
+    session.add(park_db)
+    session.commit()
+    invalidate_park_cache()
 
-        delete_file(filename, PARKS_DIR)
-        return None
+    delete_file(filename, PARKS_DIR)
+    return None
 
 
 # ---------- SPECIES ENDPOINTS (JOIN-BASED) ----------
@@ -694,6 +1047,7 @@ def list_species(
     park_id: int | None = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    session: Session = Depends(get_db),
 ):
     """
     Get a list of all species.
@@ -702,177 +1056,98 @@ def list_species(
     - type: Filter by 'animal' or 'plant'
     - park_id: Filter species by park ID
     """
-    with Session(engine) as session:
-        stmt = select(SpeciesDB)
+    page = select(SpeciesDB.species_id)
 
-        if type is not None:
-            stmt = stmt.where(SpeciesDB.type == type)
+    if type is not None:
+        page = page.where(SpeciesDB.type == type)
 
-        if park_id is not None:
-            stmt = (
-                stmt.join(
-                    ParkSpeciesLink,
-                    ParkSpeciesLink.species_id == SpeciesDB.species_id,
-                )
-                .where(ParkSpeciesLink.park_id == park_id)
+    if park_id is not None:
+        page = (
+            page.join(
+                ParkSpeciesLink,
+                ParkSpeciesLink.species_id == SpeciesDB.species_id,
             )
+            .where(ParkSpeciesLink.park_id == park_id)
+        )
 
-        stmt = stmt.offset(skip).limit(limit)
-        species_rows = session.exec(stmt).all()
+    page = page.order_by(SpeciesDB.species_id).offset(skip).limit(limit).subquery()
 
-        if species_rows:
-            species_ids = [s.species_id for s in species_rows]
-            links = session.exec(
-                select(ParkSpeciesLink).where(
-                    ParkSpeciesLink.species_id.in_(species_ids)
-                )
-            ).all()
-            park_ids_map: dict[int, list[int]] = {}
-            for link in links:
-                park_ids_map.setdefault(link.species_id, []).append(link.park_id)
-        else:
-            park_ids_map = {}
-
-        return [
-            Species(
-                id=s.species_id,
-                name=s.name,
-                type=s.type,
-                scientific_name=s.scientific_name,
-                description=s.description,
-                threats=s.threats or "",
-                protection_measures=s.protection_measures or "",
-                safety_guidelines=s.safety_guidelines or "",
-                medicinal_use=s.medicinal_use,
-                image_url=get_file_url(s.image_url, "species") if s.image_url else None,
-                park_ids=park_ids_map.get(s.species_id, []),
-            )
-            for s in species_rows
-        ]
+    # Page of species plus all of their park links in one round trip
+    rows = session.exec(
+        select(SpeciesDB, ParkSpeciesLink.park_id)
+        .options(SPECIES_SCHEMA_COLUMNS)
+        .join(page, page.c.species_id == SpeciesDB.species_id)
+        .outerjoin(ParkSpeciesLink, ParkSpeciesLink.species_id == SpeciesDB.species_id)
+        .order_by(SpeciesDB.species_id)
+    ).all()
+
+    return species_rows_to_schema(rows)
 
 
 @app.get("/api/species/{species_id}", response_model=Species, tags=["Species"])
-def get_species(species_id: int):
-    with Session(engine) as session:
-        s = session.get(SpeciesDB, species_id)
-        if s is None:
-            raise HTTPException(status_code=404, detail="Species not found")
-
-        links = session.exec(
-            select(ParkSpeciesLink).where(ParkSpeciesLink.species_id == s.species_id)
-        ).all()
-        park_ids = [l.park_id for l in links]
-
-        return Species(
-            id=s.species_id,
-            name=s.name,
-            type=s.type,
-            scientific_name=s.scientific_name,
-            description=s.description,
-            threats=s.threats or "",
-            protection_measures=s.protection_measures or "",
-            safety_guidelines=s.safety_guidelines or "",
-            medicinal_use=s.medicinal_use,
-            image_url=get_file_url(s.image_url, "species") if s.image_url else None,
-            park_ids=park_ids,
-        )
+def get_species(species_id: int, session: Session = Depends(get_db)):
+    rows = session.exec(
+        select(SpeciesDB, ParkSpeciesLink.park_id)
+        .options(SPECIES_SCHEMA_COLUMNS)
+        .outerjoin(ParkSpeciesLink, ParkSpeciesLink.species_id == SpeciesDB.species_id)
+        .where(SpeciesDB.species_id == species_id)
+    ).all()
+    if not rows:
+        raise HTTPException(status_code=404, detail="Species not found")
 
+    return species_rows_to_schema(rows)[0]
 
-@app.get("/api/parks/{park_id}/species", response_model=List[Species], tags=["Species"])
-def list_species_for_park(park_id: int):
-    with Session(engine) as session:
-        park = session.get(ParkDB, park_id)
-        if park is None:
-            raise HTTPException(status_code=404, detail="Park not found")
-
-        links = session.exec(
-            select(ParkSpeciesLink).where(ParkSpeciesLink.park_id == park_id)
-        ).all()
-        species_ids = [l.species_id for l in links]
-        if not species_ids:
-            return []
 
-        species_rows = session.exec(
-            select(SpeciesDB).where(SpeciesDB.species_id.in_(species_ids))
-        ).all()
+@app.get("/api/parks/{park_id}/species", response_model=List[Species], tags=["Species"])
+def list_species_for_park(park_id: int, session: Session = Depends(get_db)):
+    in_park = aliased(ParkSpeciesLink)
+
+    # Species found in this park, each joined to all of its park links
+    rows = session.exec(
+        select(SpeciesDB, ParkSpeciesLink.park_id)
+        .options(SPECIES_SCHEMA_COLUMNS)
+        .join(
+            in_park,
+            and_(in_park.species_id == SpeciesDB.species_id, in_park.park_id == park_id),
+        )
+        .join(ParkSpeciesLink, ParkSpeciesLink.species_id == SpeciesDB.species_id)
+        .order_by(SpeciesDB.species_id)
+    ).all()
+    if not rows:
+        # Only hit the parks table to tell "no species" from "no park"
+        ensure_park_exists(session, park_id)
+        return []
 
-        links_all = session.exec(
-            select(ParkSpeciesLink).where(
-                ParkSpeciesLink.species_id.in_([s.species_id for s in species_rows])
-            )
-        ).all()
-        park_ids_map: dict[int, list[int]] = {}
-        for link in links_all:
-            park_ids_map.setdefault(link.species_id, []).append(link.park_id)
-
-        return [
-            Species(
-                id=s.species_id,
-                name=s.name,
-                type=s.type,
-                scientific_name=s.scientific_name,
-                description=s.description,
-                threats=s.threats or "",
-                protection_measures=s.protection_measures or "",
-                safety_guidelines=s.safety_guidelines or "",
-                medicinal_use=s.medicinal_use,
-                image_url=get_file_url(s.image_url, "species") if s.image_url else None,
-                park_ids=park_ids_map.get(s.species_id, []),
-            )
-            for s in species_rows
-        ]
+    return species_rows_to_schema(rows)
 
 
 @app.post("/api/species", response_model=Species, status_code=201, tags=["Species"])
 def create_species(
     species_in: SpeciesCreate,
     current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_db),
 ):
-    with Session(engine) as session:
-        species_db = SpeciesDB(
-            name=species_in.name,
-            type=species_in.type,
-            scientific_name=species_in.scientific_name,
-            description=species_in.description,
-            threats=species_in.threats,
-            protection_measures=species_in.protection_measures,
-            safety_guidelines=species_in.safety_guidelines,
-            medicinal_use=species_in.medicinal_use,
-            image_url=species_in.image_url,
-        )
-        session.add(species_db)
-        session.commit()
-        session.refresh(species_db)
-
-        for park_id in species_in.park_ids:
-            park = session.get(ParkDB, park_id)
-            if park:
-                session.add(
-                    ParkSpeciesLink(
-                        park_id=park.id,
-                        species_id=species_db.species_id,
-                    )
-                )
-        session.commit()
+    species_db = SpeciesDB(
+        name=species_in.name,
+        type=species_in.type,
+        scientific_name=species_in.scientific_name,
+        description=species_in.description,
+        threats=species_in.threats,
+        protection_measures=species_in.protection_measures,
+        safety_guidelines=species_in.safety_guidelines,
+        medicinal_use=species_in.medicinal_use,
+        image_url=species_in.image_url,
+    )
+    session.add(species_db)
+    session.flush()
 
-        links = session.exec(
-            select(ParkSpeciesLink).where(ParkSpeciesLink.species_id == species_db.species_id)
-        ).all()
-        park_ids = [l.park_id for l in links]
-
-        return Species(
-            id=species_db.species_id,
-            name=species_db.name,
-            type=species_db.type,
-            scientific_name=species_db.scientific_name,
-            description=species_db.description,
-            threats=species_db.threats or "",
-            protection_measures=species_db.protection_measures or "",
-            safety_guidelines=species_db.safety_guidelines or "",
-            medicinal_use=species_db.medicinal_use,
-            image_url=get_file_url(species_db.image_url, "species") if species_db.image_url else None,
-            park_ids=park_ids,
-        )
+    # Unknown park ids are ignored, as before
+    park_ids = sorted(existing_park_ids(session, species_in.park_ids))
+    add_species_links(session, species_db.species_id, park_ids)
+    session.commit()
+    session.refresh(species_db)
+
+    return species_to_schema(species_db, park_ids)
 
 
 @app.put("/api/species/{species_id}", response_model=Species, tags=["Species"])
@@ -880,193 +1155,135 @@ def update_species(
     species_id: int,
     species_in: SpeciesUpdate,
     current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_db),
 ):
-    with Session(engine) as session:
-        species_db = session.get(SpeciesDB, species_id)
-        if species_db is None:
-            raise HTTPException(status_code=404, detail="Species not found")
-
-        data = species_in.model_dump(exclude_unset=True)
-
-        simple_fields = {
-            "name",
-            "type",
-            "scientific_name",
-            "description",
-            "threats",
-            "protection_measures",
-            "safety_guidelines",
-            "medicinal_use",
-            "image_url",
-        }
-        for field in simple_fields:
-            if field in data:
-                setattr(species_db, field, data[field])
+    species_db = session.get(SpeciesDB, species_id)
+    if species_db is None:
+        raise HTTPException(status_code=404, detail="Species not found")
+
+    data = species_in.model_dump(exclude_unset=True)
+
+    simple_fields = {
+        "name",
+        "type",
+        "scientific_name",
+        "description",
+        "threats",
+        "protection_measures",
+        "safety_guidelines",
+        "medicinal_use",
+        "image_url",
+    }
+    for field in simple_fields:
+        if field in data:
+            setattr(species_db, field, data[field])
+
+    existing_ids = set(
+        session.exec(
+            select(ParkSpeciesLink.park_id).where(
+                ParkSpeciesLink.species_id == species_db.species_id
+            )
+        ).all()
+    )
 
-        if "park_ids" in data:
-            new_ids = set(data["park_ids"] or [])
+    if "park_ids" in data:
+        new_ids = set(data["park_ids"] or [])
 
-            existing_links = session.exec(
-                select(ParkSpeciesLink).where(
-                    ParkSpeciesLink.species_id == species_db.species_id
+        to_delete = existing_ids - new_ids
+        if to_delete:
+            session.exec(
+                delete(ParkSpeciesLink).where(
+                    ParkSpeciesLink.species_id == species_db.species_id,
+                    ParkSpeciesLink.park_id.in_(to_delete),
                 )
-            ).all()
-            existing_ids = {l.park_id for l in existing_links}
-
-            for link in existing_links:
-                if link.park_id not in new_ids:
-                    session.delete(link)
-
-            for park_id in new_ids - existing_ids:
-                park = session.get(ParkDB, park_id)
-                if park:
-                    session.add(
-                        ParkSpeciesLink(
-                            park_id=park.id,
-                            species_id=species_db.species_id,
-                        )
-                    )
-
-        session.add(species_db)
-        session.commit()
+            )
 
-        links = session.exec(
-            select(ParkSpeciesLink).where(ParkSpeciesLink.species_id == species_db.species_id)
-        ).all()
-        park_ids = [l.park_id for l in links]
-
-        return Species(
-            id=species_db.species_id,
-            name=species_db.name,
-            type=species_db.type,
-            scientific_name=species_db.scientific_name,
-            description=species_db.description,
-            threats=species_db.threats or "",
-            protection_measures=species_db.protection_measures or "",
-            safety_guidelines=species_db.safety_guidelines or "",
-            medicinal_use=species_db.medicinal_use,
-            image_url=get_file_url(species_db.image_url, "species") if species_db.image_url else None,
-            park_ids=park_ids,
-        )
+        to_add = existing_park_ids(session, new_ids - existing_ids)
+        add_species_links(session, species_db.species_id, to_add)
+        existing_ids = (existing_ids & new_ids) | to_add
+
+    session.add(species_db)
+    session.commit()
+    session.refresh(species_db)
+
+    return species_to_schema(species_db, sorted(existing_ids))
 
 
 @app.delete("/api/species/{species_id}", status_code=204, tags=["Species"])
 def delete_species(
     species_id: int,
     current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_db),
 ):
-    with Session(engine) as session:
-        species_db = session.get(SpeciesDB, species_id)
-        if species_db is None:
-            raise HTTPException(status_code=404, detail="Species not found")
+    species_db = session.get(SpeciesDB, species_id)
+    if species_db is None:
+        raise HTTPException(status_code=404, detail="Species not found")
 
-        if species_db.image_url:
-            delete_file(species_db.image_url, SPECIES_DIR)
+    image_url = species_db.image_url
 
-        session.exec(
-            select(ParkSpeciesLink)
-            .where(ParkSpeciesLink.species_id == species_db.species_id)
-        )
-        session.query(ParkSpeciesLink).filter(
+    session.exec(
+        delete(ParkSpeciesLink).where(
             ParkSpeciesLink.species_id == species_db.species_id
-        ).delete(synchronize_session=False)
+        )
+    )
+    session.delete(species_db)
+    session.commit()
 
-        session.delete(species_db)
-        session.commit()
-        return None
+    # Remove the image only once the rows are gone for good
+    if image_url:
+        delete_file(image_url, SPECIES_DIR)
+    return None
 
 
 # ---------- TRAIL ENDPOINTS ----------
 
 @app.get("/api/parks/{park_id}/trails", response_model=List[Trail], tags=["Trails"])
-def list_trails_for_park(park_id: int):
+def list_trails_for_park(park_id: int, session: Session = Depends(get_db)):
     """List all trails for a given park."""
-    with Session(engine) as session:
-        park = session.get(ParkDB, park_id)
-        if park is None:
-            raise HTTPException(status_code=404, detail="Park not found")
+    ensure_park_exists(session, park_id)
 
-        trails_db = session.exec(
-            select(TrailDB).where(TrailDB.park_id == park_id)
-        ).all()
+    trails_db = session.exec(
+        select(TrailDB).where(TrailDB.park_id == park_id)
+    ).all()
 
-        return [
-            Trail(
-                trail_id=t.trail_id,
-                park_id=t.park_id,
-                name=t.name,
-                description=t.description,
-                difficulty=t.difficulty,
-                length_km=t.length_km,
-                duration_hours=t.duration_hours,
-                elevation_gain=t.elevation_gain,
-                trail_type=t.trail_type,
-                highlights=json.loads(t.highlights) if t.highlights else [],
-            )
-            for t in trails_db
-        ]
+    return [trail_to_schema(t) for t in trails_db]
 
 
 @app.get("/api/trails/{trail_id}", response_model=Trail, tags=["Trails"])
-def get_trail(trail_id: int):
+def get_trail(trail_id: int, session: Session = Depends(get_db)):
     """Get details of a specific trail."""
-    with Session(engine) as session:
-        t = session.get(TrailDB, trail_id)
-        if t is None:
-            raise HTTPException(status_code=404, detail="Trail not found")
-
-        return Trail(
-            trail_id=t.trail_id,
-            park_id=t.park_id,
-            name=t.name,
-            description=t.description,
-            difficulty=t.difficulty,
-            length_km=t.length_km,
-            duration_hours=t.duration_hours,
-            elevation_gain=t.elevation_gain,
-            trail_type=t.trail_type,
-            highlights=json.loads(t.highlights) if t.highlights else [],
-        )
+    t = session.get(TrailDB, trail_id)
+    if t is None:
+        raise HTTPException(status_code=404, detail="Trail not found")
+
+    return trail_to_schema(t)
 
 
 @app.post("/api/trails", response_model=Trail, status_code=201, tags=["Trails"])
 def create_trail(
     trail_in: TrailCreate,
     current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_db),
 ):
     """Create a new trail (requires authentication)."""
-    with Session(engine) as session:
-        park = session.get(ParkDB, trail_in.park_id)
-        if park is None:
-            raise HTTPException(status_code=404, detail="Park not found")
-
-        trail_db = TrailDB(
-            park_id=trail_in.park_id,
-            name=trail_in.name,
-            description=trail_in.description,
-            difficulty=trail_in.difficulty,
-            length_km=trail_in.length_km,
-            duration_hours=trail_in.duration_hours,
-            elevation_gain=trail_in.elevation_gain,
-            trail_type=trail_in.trail_type,
-            highlights=json.dumps(trail_in.highlights or []),
-        )
-        session.add(trail_db)
-        session.commit()
-        session.refresh(trail_db)
-
-        return Trail(
-            trail_id=trail_db.trail_id,
-            park_id=trail_db.park_id,
-            name=trail_db.name,
-            description=trail_db.description,
-            difficulty=trail_db.difficulty,
-            length_km=trail_db.length_km,
-            duration_hours=trail_db.duration_hours,
-            elevation_gain=trail_db.elevation_gain,
-            trail_type=trail_db.trail_type,
-            highlights=trail_in.highlights or [],
-        )
+    ensure_park_exists(session, trail_in.park_id)
+
+    trail_db = TrailDB(
+        park_id=trail_in.park_id,
+        name=trail_in.name,
+        description=trail_in.description,
+        difficulty=trail_in.difficulty,
+        length_km=trail_in.length_km,
+        duration_hours=trail_in.duration_hours,
+        elevation_gain=trail_in.elevation_gain,
+        trail_type=trail_in.trail_type,
+        highlights=trail_in.highlights or [],
+    )
+    session.add(trail_db)
+    session.commit()
+    session.refresh(trail_db)
+
+    return trail_to_schema(trail_db)
 
 
 @app.put("/api/trails/{trail_id}", response_model=Trail, tags=["Trails"])
@@ -1074,58 +1291,42 @@ def update_trail(
     trail_id: int,
     trail_in: TrailUpdate,
     current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_db),
 ):
     """Update an existing trail (requires authentication)."""
-    with Session(engine) as session:
-        trail_db = session.get(TrailDB, trail_id)
-        if trail_db is None:
-            raise HTTPException(status_code=404, detail="Trail not found")
+    trail_db = session.get(TrailDB, trail_id)
+    if trail_db is None:
+        raise HTTPException(status_code=404, detail="Trail not found")
 
-        data = trail_in.model_dump(exclude_unset=True)
+    data = trail_in.model_dump(exclude_unset=True)
 
-        if "park_id" in data:
-            park = session.get(ParkDB, data["park_id"])
-            if park is None:
-                raise HTTPException(status_code=404, detail="Park not found")
+    if "park_id" in data:
+        ensure_park_exists(session, data["park_id"])
 
-        for field, value in data.items():
-            if field == "highlights" and value is not None:
-                setattr(trail_db, "highlights", json.dumps(value))
-            else:
-                setattr(trail_db, field, value)
+    for field, value in data.items():
+        setattr(trail_db, field, value)
 
-        session.add(trail_db)
-        session.commit()
-        session.refresh(trail_db)
-
-        return Trail(
-            trail_id=trail_db.trail_id,
-            park_id=trail_db.park_id,
-            name=trail_db.name,
-            description=trail_db.description,
-            difficulty=trail_db.difficulty,
-            length_km=trail_db.length_km,
-            duration_hours=trail_db.duration_hours,
-            elevation_gain=trail_db.elevation_gain,
-            trail_type=trail_db.trail_type,
-            highlights=json.loads(trail_db.highlights) if trail_db.highlights else [],
-        )
+    session.add(trail_db)
+    session.commit()
+    session.refresh(trail_db)
+
+    return trail_to_schema(trail_db)
 
 
 @app.delete("/api/trails/{trail_id}", status_code=204, tags=["Trails"])
 def delete_trail(
     trail_id: int,
     current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_db),
 ):
     """Delete a trail (requires authentication)."""
-    with Session(engine) as session:
-        trail_db = session.get(TrailDB, trail_id)
-        if trail_db is None:
-            raise HTTPException(status_code=404, detail="Trail not found")
+    trail_db = session.get(TrailDB, trail_id)
+    if trail_db is None:
+        raise HTTPException(status_code=404, detail="Trail not found")
 
-        session.delete(trail_db)
-        session.commit()
-        return None
+    session.delete(trail_db)
+    session.commit()
+    return None
 
 
 # ---------- SPECIES IMAGE ENDPOINTS ----------
@@ -1137,48 +1338,48 @@ async def upload_species_image(
     species_id: int,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_db),
 ):
-    with Session(engine) as session:
-        species_db = session.get(SpeciesDB, species_id)
-        if species_db is None:
-            raise HTTPException(status_code=404, detail="Species not found")
+    species_db = session.get(SpeciesDB, species_id)
+    if species_db is None:
+        raise HTTPException(status_code=404, detail="Species not found")
 
-        if species_db.image_url:
-            delete_file(species_db.image_url, SPECIES_DIR)
+    if species_db.image_url:
+        delete_file(species_db.image_url, SPECIES_DIR)
 
-        filename = await save_upload_file(file, SPECIES_DIR)
-        species_db.image_url = filename
+    filename = await save_upload_file(file, SPECIES_DIR)
+    species_db.image_url = filename
 
-        session.add(species_db)
-        session.commit()
-        session.refresh(species_db)
+    session.add(species_db)
+    session.commit()
+    session.refresh(species_db)
 
-        return {
-            "message": "Image uploaded successfully",
-            "filename": filename,
-            "url": get_file_url(filename, "species"),
-        }
+    return {
+        "message": "Image uploaded successfully",
+        "filename": filename,
+        "url": get_file_url(filename, "species"),
+    }
 
 
 @app.delete("/api/species/{species_id}/image", status_code=204, tags=["Species Images"])
 def delete_species_image(
     species_id: int,
     current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_db),
 ):
-    with Session(engine) as session:
-        species_db = session.get(SpeciesDB, species_id)
-        if species_db is None:
-            raise HTTPException(status_code=404, detail="Species not found")
+    species_db = session.get(SpeciesDB, species_id)
+    if species_db is None:
+        raise HTTPException(status_code=404, detail="Species not found")
 
-        if not species_db.image_url:
-            raise HTTPException(status_code=404, detail="No image to delete")
+    if not species_db.image_url:
+        raise HTTPException(status_code=404, detail="No image to delete")
 
-        delete_file(species_db.image_url, SPECIES_DIR)
+    delete_file(species_db.image_url, SPECIES_DIR)
 
-        species_db.image_url = None
-        session.add(species_db)
-        session.commit()
-        return None
+    species_db.image_url = None
+    session.add(species_db)
+    session.commit()
+    return None
 
 
 # ---------- WEATHER ENDPOINTS ----------
@@ -1195,137 +1396,304 @@ async def get_current_weather(
 
 
 @app.get("/api/parks/{park_id}/weather", tags=["Weather"])
-async def get_park_weather(park_id: int):
-    with Session(engine) as session:
-        park = session.get(ParkDB, park_id)
-        if park is None:
-            raise HTTPException(status_code=404, detail="Park not found")
+async def get_park_weather(park_id: int, session: Session = Depends(get_db)):
+    # The sync DB lookup runs in the threadpool so the event loop stays free
+    # for other requests' outbound weather calls.
+    park = await to_thread.run_sync(
+        read_then_release, session, get_park_location, park_id
+    )
 
-        weather_data = await get_weather_for_location(park.latitude, park.longitude)
-        if "error" in weather_data:
-            raise HTTPException(status_code=503, detail=weather_data)
+    weather_data = await get_weather_for_location(park.latitude, park.longitude)
+    if "error" in weather_data:
+        raise HTTPException(status_code=503, detail=weather_data)
 
-        return {
-            "park_id": park.id,
-            "park_name": park.name,
-            "weather": weather_data,
-        }
+    return {
+        "park_id": park.id,
+        "park_name": park.name,
+        "weather": weather_data,
+    }
 
 
 @app.get("/api/parks/{park_id}/forecast", tags=["Weather"])
-async def get_park_forecast(park_id: int, days: int = 5):
+async def get_park_forecast(
+    park_id: int,
+    days: int = 5,
+    session: Session = Depends(get_db),
+):
     if days < 1 or days > 5:
         raise HTTPException(status_code=400, detail="Days must be between 1 and 5")
 
-    with Session(engine) as session:
-        park = session.get(ParkDB, park_id)
-        if park is None:
-            raise HTTPException(status_code=404, detail="Park not found")
+    park = await to_thread.run_sync(
+        read_then_release, session, get_park_location, park_id
+    )
+
+    forecast_data = await get_weather_forecast(park.latitude, park.longitude, days)
+    if "error" in forecast_data:
+        raise HTTPException(status_code=503, detail=forecast_data)
 
-        forecast_data = await get_weather_forecast(park.latitude, park.longitude, days)
-        if "error" in forecast_data:
-            raise HTTPException(status_code=503, detail=forecast_data)
+    return {
+        "park_id": park.id,
+        "park_name": park.name,
+        "forecast": forecast_data,
+    }
 
-        return {
+
+@app.get("/api/maps/all-parks/weather", tags=["Weather"])
+async def get_all_parks_weather(session: Session = Depends(get_db)):
+    """Current weather for every park, with the upstream calls made concurrently."""
+    def load_parks(session: Session):
+        return session.exec(
+            select(ParkDB.id, ParkDB.name, ParkDB.latitude, ParkDB.longitude)
+        ).all()
+
+    parks = await to_thread.run_sync(read_then_release, session, load_parks)
+    results = await asyncio.gather(
+        *(get_weather_for_location(park.latitude, park.longitude) for park in parks)
+    )
+
+    parks_weather = []
+    for park, weather_data in zip(parks, results):
+        entry = {
             "park_id": park.id,
             "park_name": park.name,
-            "forecast": forecast_data,
+            "latitude": park.latitude,
+            "longitude": park.longitude,
         }
+        if "error" in weather_data:
+            entry["weather"] = None
+            entry["error"] = weather_data
+        else:
+            entry["weather"] = weather_data
+        parks_weather.append(entry)
+
+    return {
+        "total_parks": len(parks_weather),
+        "parks": parks_weather,
+    }
 
 
 # ---------- MAP & DIRECTIONS ENDPOINTS ----------
 
+# Map URLs depend only on the coordinates, so keying the cache on (lat, lng)
+# also keeps it correct when a park is moved.
+@lru_cache(maxsize=512)
+def _maps_url(latitude: float, longitude: float) -> str:
+    return f"https://www.google.com/maps?q={latitude},{longitude}"
+
+
+@lru_cache(maxsize=512)
+def _directions_url(latitude: float, longitude: float) -> str:
+    return (
+        "https://www.google.com/maps/dir/?api=1"
+        f"&destination={latitude},{longitude}"
+    )
+
+
+# Origins are arbitrary user coordinates, so this one is not memoized;
+# a bound str.format fills the whole template in one call.
+_driving_directions_url = (
+    "https://www.google.com/maps/dir/?api=1"
+    "&destination={},{}&origin={},{}&travelmode=driving"
+).format
+
+
 @app.get("/map", response_class=HTMLResponse, tags=["Maps & Navigation"])
 async def view_interactive_map(request: Request):
-    return templates.TemplateResponse("map.html", {"request": request})
+    return templates.TemplateResponse(
+        request,
+        "map.html",
+        headers={"Cache-Control": f"public, max-age={CACHE_MAX_AGE}"},
+    )
 
 
 @app.get("/api/parks/{park_id}/map", response_model=MapData, tags=["Maps & Navigation"])
-def get_park_map_data(park_id: int):
-    with Session(engine) as session:
-        park = session.get(ParkDB, park_id)
-        if park is None:
-            raise HTTPException(status_code=404, detail="Park not found")
-
-        google_maps_url = f"https://www.google.com/maps?q={park.latitude},{park.longitude}"
-        directions_url = (
-            "https://www.google.com/maps/dir/?api=1"
-            f"&destination={park.latitude},{park.longitude}"
-        )
-
-        return MapData(
+# HEAD shares the handler (cacheable_json_response drops the body) but stays
+# out of the schema, which would otherwise repeat the operation id
+@app.head("/api/parks/{park_id}/map", include_in_schema=False)
+def get_park_map_data(request: Request, park_id: int, session: Session = Depends(get_db)):
+    cache_key = f"park-map:{park_id}"
+    map_data = get_cached_park_data(cache_key)
+    if map_data is None:
+        park = get_park_location(session, park_id)
+        map_data = MapData(
             park_id=park.id,
             park_name=park.name,
             latitude=park.latitude,
             longitude=park.longitude,
             governorate=park.governorate,
-            google_maps_url=google_maps_url,
-            directions_url=directions_url,
+            google_maps_url=park.google_maps_url,
+            directions_url=_directions_url(park.latitude, park.longitude),
         )
+        set_cached_park_data(cache_key, map_data)
+
+    return cacheable_json_response(
+        request, map_data, max_age=MAP_CACHE_MAX_AGE, s_maxage=MAP_CACHE_S_MAXAGE
+    )
 
 
 @app.get("/api/maps/all-parks", tags=["Maps & Navigation"])
-def get_all_parks_map_data():
-    with Session(engine) as session:
-        parks = session.exec(select(ParkDB)).all()
-
-        parks_data = []
-        for park in parks:
-            google_maps_url = f"https://www.google.com/maps?q={park.latitude},{park.longitude}"
-            directions_url = (
-                "https://www.google.com/maps/dir/?api=1"
-                f"&destination={park.latitude},{park.longitude}"
-            )
+@app.head("/api/maps/all-parks", include_in_schema=False)
+def get_all_parks_map_data(request: Request, session: Session = Depends(get_db)):
+    cached = get_cached_park_data("all-parks-map")
+    if cached is not None:
+        return cacheable_json_response(
+            request, cached, max_age=MAP_CACHE_MAX_AGE, s_maxage=MAP_CACHE_S_MAXAGE
+        )
 
-            parks_data.append(
-                {
-                    "park_id": park.id,
-                    "park_name": park.name,
-                    "latitude": park.latitude,
-                    "longitude": park.longitude,
-                    "governorate": park.governorate,
-                    "google_maps_url": google_maps_url,
-                    "directions_url": directions_url,
-                    "description": (
-                        park.description[:100] + "..."
-                        if len(park.description) > 100
-                        else park.description
-                    ),
-                }
-            )
+    # Only the columns the markers need; images and the full description
+    # are never loaded.
+    rows = session.exec(
+        select(
+            ParkDB.id,
+            ParkDB.name,
+            ParkDB.latitude,
+            ParkDB.longitude,
+            ParkDB.governorate,
+            ParkDB.google_maps_url,
+            func.substr(ParkDB.description, 1, 100),
+            func.length(ParkDB.description) > 100,
+        )
+    ).all()
+
+    parks_data = []
+    for (
+        park_id,
+        name,
+        latitude,
+        longitude,
+        governorate,
+        google_maps_url,
+        description,
+        truncated,
+    ) in rows:
+        parks_data.append(
+            {
+                "park_id": park_id,
+                "park_name": name,
+                "latitude": latitude,
+                "longitude": longitude,
+                "governorate": governorate,
+                "google_maps_url": google_maps_url,
+                "directions_url": _directions_url(latitude, longitude),
+                "description": description + "..." if truncated else description,
+            }
+        )
 
-        return {
-            "total_parks": len(parks_data),
-            "parks": parks_data,
-        }
+    result = {
+        "total_parks": len(parks_data),
+        "parks": parks_data,
+    }
+    set_cached_park_data("all-parks-map", result)
+    return cacheable_json_response(
+        request, result, max_age=MAP_CACHE_MAX_AGE, s_maxage=MAP_CACHE_S_MAXAGE
+    )
 
 
 @app.post("/api/maps/directions", tags=["Maps & Navigation"])
-def get_directions_to_park(directions: DirectionsRequest):
-    with Session(engine) as session:
-        park = session.get(ParkDB, directions.destination_park_id)
-        if park is None:
-            raise HTTPException(status_code=404, detail="Park not found")
-
-        directions_url = (
-            "https://www.google.com/maps/dir/?api=1"
-            f"&origin={directions.origin_lat},{directions.origin_lng}"
-            f"&destination={park.latitude},{park.longitude}"
-            f"&travelmode=driving"
+def get_directions_to_park(
+    directions: DirectionsRequest,
+    session: Session = Depends(get_db),
+):
+    park = get_park_location(session, directions.destination_park_id)
+
+    directions_url = _driving_directions_url(
+        park.latitude, park.longitude, directions.origin_lat, directions.origin_lng
+    )
+
+    return {
+        "park_id": park.id,
+        "park_name": park.name,
+        "origin": {
+            "latitude": directions.origin_lat,
+            "longitude": directions.origin_lng,
+        },
+        "destination": {
+            "latitude": park.latitude,
+            "longitude": park.longitude,
+        },
+        "directions_url": directions_url,
+        "google_maps_url": park.google_maps_url,
+    }
+
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = 111.32
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points, in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+@app.get("/api/maps/nearest-parks", response_model=List[NearbyPark], tags=["Maps & Navigation"])
+def get_nearest_parks(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(200, gt=0, le=1000),
+    limit: int = Query(5, ge=1, le=20),
+    session: Session = Depends(get_db),
+):
+    """
+    Parks closest to a point, nearest first.
+
+    A bounding box around the point is filtered in SQL (served by
+    ix_parks_lat_lng); exact distances are only computed for that subset.
+    """
+    d_lat = radius_km / KM_PER_DEGREE_LAT
+    d_lng = radius_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 0.01))
+
+    rows = session.exec(
+        select(
+            ParkDB.id,
+            ParkDB.name,
+            ParkDB.latitude,
+            ParkDB.longitude,
+            ParkDB.governorate,
+            ParkDB.google_maps_url,
+        ).where(
+            ParkDB.latitude.between(lat - d_lat, lat + d_lat),
+            ParkDB.longitude.between(lng - d_lng, lng + d_lng),
         )
+    ).all()
+
+    nearby = []
+    for park_id, name, latitude, longitude, governorate, google_maps_url in rows:
+        distance = haversine_km(lat, lng, latitude, longitude)
+        if distance <= radius_km:
+            nearby.append(
+                NearbyPark.model_construct(
+                    park_id=park_id,
+                    park_name=name,
+                    latitude=latitude,
+                    longitude=longitude,
+                    governorate=governorate,
+                    google_maps_url=google_maps_url,
+                    distance_km=round(distance, 1),
+                )
+            )
 
-        return {
-            "park_id": park.id,
-            "park_name": park.name,
-            "origin": {
-                "latitude": directions.origin_lat,
-                "longitude": directions.origin_lng,
-            },
-            "destination": {
-                "latitude": park.latitude,
-                "longitude": park.longitude,
-            },
-            "directions_url": directions_url,
-            "google_maps_url": f"https://www.google.com/maps?q={park.latitude},{park.longitude}",
-        }
- 
\ No newline at end of file
+    nearby.sort(key=lambda park: park.distance_km)
+    return nearby[:limit]
+ 
+
+
+if __name__ == "__main__":
+    import os
+
+    import uvicorn
+
+    # uvloop and httptools ship with uvicorn[standard]; ask for them explicitly
+    # so a missing extra fails loudly instead of falling back to asyncio/h11.
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=os.cpu_count(),
+        log_level="warning",
+    )
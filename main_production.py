@@ -1,9 +1,13 @@
 import logging
+import queue
 import sys
+import time
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 from typing import AsyncGenerator
 
 import sentry_sdk
+from anyio import to_thread
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
@@ -13,6 +17,7 @@ from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
+from sqlalchemy import text
 
 from config import settings
 from database import engine, Base
@@ -20,14 +25,22 @@ from routers import parks, species, trails, reviews, auth, emergency
 from routers.pages import pages_router
 
 # ========== LOGGING SETUP ==========
-logging.basicConfig(
-    level=getattr(logging, settings.LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('logs/app.log')
-    ]
-)
+# Records are only enqueued on the request path; the listener thread does
+# the formatting and the blocking stdout/file writes.
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [logging.StreamHandler(sys.stdout), logging.FileHandler('logs/app.log')]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+log_listener = QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+
+# The queue handler only passes the message through; _log_formatter on the
+# listener's handlers applies the real format exactly once.
+_log_queue_handler = QueueHandler(_log_queue)
+_log_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.getLogger().addHandler(_log_queue_handler)
+logging.getLogger().setLevel(getattr(logging, settings.LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
 # ========== SENTRY MONITORING ==========
@@ -49,6 +62,7 @@ if settings.SENTRY_DSN:
 async def lifespan(app: FastAPI) -> AsyncGenerator:
     """Application lifespan events"""
     # Startup
+    log_listener.start()
     logger.info("🚀 Starting Tunisia Parks API")
     
     # Create tables
@@ -63,6 +77,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     
     # Shutdown
     logger.info("🛑 Shutting down Tunisia Parks API")
+    log_listener.stop()  # flushes anything still queued
 
 # ========== APPLICATION INSTANCE ==========
 app = FastAPI(
@@ -85,8 +100,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Gzip compression
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# Gzip compression: bodies under 1 KiB (single-park payloads, health
+# checks) are not worth the CPU; larger JSON compresses well even at a
+# moderate level. Event streams are never buffered by GZipMiddleware.
+app.add_middleware(
+    GZipMiddleware, minimum_size=1024, compresslevel=settings.GZIP_COMPRESS_LEVEL
+)
 
 # Trusted hosts (security)
 if not settings.DEBUG:
@@ -98,10 +117,11 @@ if not settings.DEBUG:
 # Request logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    logger.info(f"📥 {request.method} {request.url.path}")
+    # Per-request lines are debug-level detail; nginx already keeps the access log
+    logger.debug("📥 %s %s", request.method, request.url.path)
     try:
         response = await call_next(request)
-        logger.info(f"📤 {request.method} {request.url.path} - {response.status_code}")
+        logger.debug("📤 %s %s - %d", request.method, request.url.path, response.status_code)
         return response
     except Exception as e:
         logger.error(f"❌ {request.method} {request.url.path} - Error: {str(e)}")
@@ -151,16 +171,27 @@ async def general_exception_handler(request: Request, exc: Exception):
 
 # ========== HEALTH CHECK ==========
 
+_last_db_ok = 0.0
+
+
+def _probe_database() -> None:
+    conn = engine.connect()
+    try:
+        conn.execute(text("SELECT 1"))
+    finally:
+        conn.close()
+
+
 @app.get("/health", tags=["System"])
 async def health_check():
     """Health check endpoint for monitoring"""
+    global _last_db_ok
     try:
-        # Check database connection
-        from database import SessionLocal
-        db = SessionLocal()
-        db.execute("SELECT 1")
-        db.close()
-        
+        # Check database connection (reuse a recent successful probe)
+        if time.monotonic() - _last_db_ok >= settings.HEALTH_CACHE_TTL:
+            await to_thread.run_sync(_probe_database)
+            _last_db_ok = time.monotonic()
+
         return {
             "status": "healthy",
             "service": "Tunisia Parks API",
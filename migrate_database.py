@@ -3,10 +3,9 @@ Migrate existing database to new schema
 Run: python migrate_database.py
 """
 
-from sqlmodel import SQLModel, Session, create_engine, select
+from sqlmodel import SQLModel, Session, create_engine, func, select, update
 from models import *
 from database import engine
-import json
 
 def migrate_database():
     print("=== DATABASE MIGRATION ===\n")
@@ -23,30 +22,30 @@ def migrate_database():
         
         for park in parks:
             # Add difficulty levels
-            if "Jebil" in park.park_name or "Dghoumès" in park.park_name:
+            if "Jebil" in park.name or "Dghoumès" in park.name:
                 park.difficulty_level = "difficile"
-            elif "Ichkeul" in park.park_name or "El Feija" in park.park_name:
+            elif "Ichkeul" in park.name or "El Feija" in park.name:
                 park.difficulty_level = "facile"
             else:
                 park.difficulty_level = "modéré"
             
             # Add accessibility
             accessible_parks = ["Ichkeul", "Boukornine", "Zaghouan"]
-            if any(name in park.park_name for name in accessible_parks):
-                park.accessibility = json.dumps(["family_friendly", "parking"])
+            if any(name in park.name for name in accessible_parks):
+                park.accessibility = ["family_friendly", "parking"]
             else:
-                park.accessibility = json.dumps(["parking"])
+                park.accessibility = ["parking"]
             
             # Add best months (varies by region)
-            if "Jebil" in park.park_name or "Sidi Toui" in park.park_name:
+            if "Jebil" in park.name or "Sidi Toui" in park.name:
                 # Desert parks - cooler months
-                park.best_months = json.dumps(["10", "11", "12", "1", "2", "3"])
-            elif "Ichkeul" in park.park_name:
+                park.best_months = ["10", "11", "12", "1", "2", "3"]
+            elif "Ichkeul" in park.name:
                 # Bird watching
-                park.best_months = json.dumps(["11", "12", "1", "2", "3"])
+                park.best_months = ["11", "12", "1", "2", "3"]
             else:
                 # Mountain/forest parks - spring
-                park.best_months = json.dumps(["3", "4", "5", "9", "10"])
+                park.best_months = ["3", "4", "5", "9", "10"]
             
             # Add activities
             activities_map = {
@@ -58,21 +57,26 @@ def migrate_database():
             }
             
             for key, activities in activities_map.items():
-                if key in park.park_name:
-                    park.activities = json.dumps(activities)
+                if key in park.name:
+                    park.activities = activities
                     break
             
             if not park.activities:
-                park.activities = json.dumps(["hiking", "nature_walks"])
+                park.activities = ["hiking", "nature_walks"]
             
+            # Store the map link so the API reads it instead of formatting it
+            park.google_maps_url = f"https://www.google.com/maps?q={park.latitude},{park.longitude}"
+
             # Add entrance fees
             park.entrance_fee = "Gratuit"  # Most Tunisian parks are free
             park.opening_hours = "7h00 - 18h00"
             
             session.add(park)
         
-        session.commit()
         print(f"✅ Updated {len(parks)} parks with new fields\n")
+
+        def find_park(fragment):
+            return next((park for park in parks if fragment in park.name), None)
         
         # 2. Add sample trails
         print("Adding sample trails...\n")
@@ -87,7 +91,7 @@ def migrate_database():
                 "duration_hours": 2.5,
                 "elevation_gain": 450,
                 "trail_type": "loop",
-                "highlights": json.dumps(["panoramic_view", "rock_formations", "wildlife"])
+                "highlights": ["panoramic_view", "rock_formations", "wildlife"]
             },
             {
                 "park_name": "Chaambi",
@@ -98,7 +102,7 @@ def migrate_database():
                 "duration_hours": 5.0,
                 "elevation_gain": 700,
                 "trail_type": "out_and_back",
-                "highlights": json.dumps(["summit", "cedar_forest", "panoramic_view"])
+                "highlights": ["summit", "cedar_forest", "panoramic_view"]
             },
             {
                 "park_name": "Ichkeul",
@@ -109,7 +113,7 @@ def migrate_database():
                 "duration_hours": 1.5,
                 "elevation_gain": 20,
                 "trail_type": "loop",
-                "highlights": json.dumps(["bird_observatory", "lake_views", "wetlands"])
+                "highlights": ["bird_observatory", "lake_views", "wetlands"]
             },
             {
                 "park_name": "El Feija",
@@ -120,18 +124,20 @@ def migrate_database():
                 "duration_hours": 3.0,
                 "elevation_gain": 300,
                 "trail_type": "loop",
-                "highlights": json.dumps(["cork_oak_forest", "wildlife", "stream"])
+                "highlights": ["cork_oak_forest", "wildlife", "stream"]
             }
         ]
         
+        # Rows already present (from an earlier run) are skipped, so the
+        # script can be re-run safely; the rest go in as one batch.
+        existing_trails = set(session.exec(select(TrailDB.park_id, TrailDB.name)).all())
+        new_trails = []
         for trail_data in sample_trails:
-            park = session.exec(
-                select(ParkDB).where(ParkDB.park_name.contains(trail_data["park_name"]))
-            ).first()
+            park = find_park(trail_data["park_name"])
             
-            if park:
+            if park and (park.id, trail_data["name"]) not in existing_trails:
                 trail = TrailDB(
-                    park_id=park.park_id,
+                    park_id=park.id,
                     name=trail_data["name"],
                     description=trail_data["description"],
                     difficulty=trail_data["difficulty"],
@@ -141,11 +147,11 @@ def migrate_database():
                     trail_type=trail_data["trail_type"],
                     highlights=trail_data["highlights"]
                 )
-                session.add(trail)
-                print(f"  ✅ {trail.name} → {park.park_name}")
+                new_trails.append(trail)
+                print(f"  ✅ {trail.name} → {park.name}")
         
-        session.commit()
-        print(f"\n✅ Added {len(sample_trails)} sample trails\n")
+        session.add_all(new_trails)
+        print(f"\n✅ Added {len(new_trails)} sample trails\n")
         
         # 3. Add sample reviews
         print("Adding sample reviews...\n")
@@ -185,14 +191,19 @@ def migrate_database():
             }
         ]
         
+        existing_reviews = set(
+            session.exec(
+                select(ReviewDB.park_id, ReviewDB.author_name, ReviewDB.visit_date)
+            ).all()
+        )
+        new_reviews = []
         for review_data in sample_reviews:
-            park = session.exec(
-                select(ParkDB).where(ParkDB.park_name.contains(review_data["park_name"]))
-            ).first()
+            park = find_park(review_data["park_name"])
+            review_key = (park.id, review_data["author_name"], review_data["visit_date"]) if park else None
             
-            if park:
+            if park and review_key not in existing_reviews:
                 review = ReviewDB(
-                    park_id=park.park_id,
+                    park_id=park.id,
                     author_name=review_data["author_name"],
                     rating=review_data["rating"],
                     title=review_data["title"],
@@ -200,20 +211,27 @@ def migrate_database():
                     visit_date=review_data["visit_date"],
                     helpful_count=0
                 )
-                session.add(review)
-                
-                # Update park average rating
-                reviews = session.exec(
-                    select(ReviewDB).where(ReviewDB.park_id == park.park_id)
-                ).all()
-                park.average_rating = sum(r.rating for r in reviews) / len(reviews)
-                park.total_reviews = len(reviews)
-                session.add(park)
-                
-                print(f"  ✅ Review by {review.author_name} → {park.park_name}")
+                new_reviews.append(review)
+                print(f"  ✅ Review by {review.author_name} → {park.name}")
         
-        session.commit()
-        print(f"\n✅ Added {len(sample_reviews)} sample reviews\n")
+        session.add_all(new_reviews)
+
+        # Recompute park ratings with one aggregate query and one bulk update
+        session.flush()
+        rating_stats = session.exec(
+            select(ReviewDB.park_id, func.avg(ReviewDB.rating), func.count())
+            .group_by(ReviewDB.park_id)
+        ).all()
+        if rating_stats:
+            session.execute(
+                update(ParkDB),
+                [
+                    {"id": park_id, "average_rating": average, "total_reviews": count}
+                    for park_id, average, count in rating_stats
+                ],
+            )
+        
+        print(f"\n✅ Added {len(new_reviews)} sample reviews\n")
         
         # 4. Create badges
         print("Creating achievement badges...\n")
@@ -277,13 +295,19 @@ def migrate_database():
             }
         ]
         
-        for badge_data in badges:
-            badge = BadgeDB(**badge_data)
-            session.add(badge)
+        existing_badges = set(session.exec(select(BadgeDB.name)).all())
+        new_badges = [
+            BadgeDB(**badge_data)
+            for badge_data in badges
+            if badge_data["name"] not in existing_badges
+        ]
+        for badge in new_badges:
             print(f"  ✅ {badge.icon} {badge.name}")
+        session.add_all(new_badges)
         
+        # Everything above lands in a single transaction
         session.commit()
-        print(f"\n✅ Created {len(badges)} achievement badges\n")
+        print(f"\n✅ Created {len(new_badges)} achievement badges\n")
         
     print("=" * 60)
     print("✅ MIGRATION COMPLETE!")
@@ -3,16 +3,18 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Column, JSON
+from sqlalchemy import Column, Index, JSON
 from sqlmodel import SQLModel, Field
 
 
 class ParkDB(SQLModel, table=True):
     __tablename__ = "parks"
+    # Bounding-box range scans for nearest-park lookups
+    __table_args__ = (Index("ix_parks_lat_lng", "latitude", "longitude"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    name: str = Field(index=True)
-    governorate: str
+    name: str = Field(index=True, unique=True)
+    governorate: str = Field(index=True)
     description: str
     latitude: float
     longitude: float
@@ -22,16 +24,16 @@ class ParkDB(SQLModel, table=True):
 
     # Visual enhancements
     hero_image_url: Optional[str] = None
-    gallery_images: Optional[str] = None  # JSON array: ["url1", "url2", ...]
+    gallery_images: Optional[list[str]] = Field(default=None, sa_column=Column(JSON))  # ["url1", "url2", ...]
 
     # Practical info
     difficulty_level: Optional[str] = None  # "facile", "modéré", "difficile"
-    accessibility: Optional[str] = None  # JSON: ["wheelchair", "family_friendly", "pets_allowed"]
-    best_months: Optional[str] = None  # JSON: ["3", "4", "5"] (March, April, May)
+    accessibility: Optional[list[str]] = Field(default=None, sa_column=Column(JSON))  # ["wheelchair", "family_friendly", "pets_allowed"]
+    best_months: Optional[list[str]] = Field(default=None, sa_column=Column(JSON))  # ["3", "4", "5"] (March, April, May)
 
     # Activities & facilities
-    activities: Optional[str] = None  # JSON: ["hiking", "birdwatching", "camping"]
-    facilities: Optional[str] = None  # JSON: ["parking", "toilets", "restaurant"]
+    activities: Optional[list[str]] = Field(default=None, sa_column=Column(JSON))  # ["hiking", "birdwatching", "camping"]
+    facilities: Optional[list[str]] = Field(default=None, sa_column=Column(JSON))  # ["parking", "toilets", "restaurant"]
 
     # Practical details
     entrance_fee: Optional[str] = None  # "Gratuit" or "10 TND"
@@ -61,7 +63,7 @@ class SpeciesDB(SQLModel, table=True):
     species_id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(index=True)
     scientific_name: str = Field(index=True)
-    type: str  # "animal" or "plant"
+    type: str = Field(index=True)  # "animal" or "plant"
     description: str
 
     # Existing fields
@@ -73,7 +75,7 @@ class SpeciesDB(SQLModel, table=True):
     image_url: Optional[str] = None
 
     # Enhanced multimedia
-    gallery_images: Optional[str] = None  # JSON array
+    gallery_images: Optional[list[str]] = Field(default=None, sa_column=Column(JSON))
     audio_url: Optional[str] = None  # Sound/call of the species
     video_url: Optional[str] = None  # Short video
 
@@ -86,7 +88,7 @@ class SpeciesDB(SQLModel, table=True):
     weight: Optional[str] = None
 
     # Sighting info
-    best_viewing_months: Optional[str] = None  # JSON: ["3", "4", "5"]
+    best_viewing_months: Optional[list[str]] = Field(default=None, sa_column=Column(JSON))  # ["3", "4", "5"]
     activity_time: Optional[str] = None  # "diurne", "nocturne", "crépusculaire"
     rarity: Optional[str] = None  # "common", "rare", "very_rare"
 
@@ -95,14 +97,17 @@ class SpeciesDB(SQLModel, table=True):
 
 class ParkSpeciesLink(SQLModel, table=True):
     __tablename__ = "park_species"
+    # park_id leads the composite primary key; this covers the other
+    # direction ("parks of this species") without touching the table
+    __table_args__ = (Index("ix_park_species_species_park", "species_id", "park_id"),)
 
-    park_id: int = Field(foreign_key="parks.id", primary_key=True)
-    species_id: int = Field(foreign_key="species.species_id", primary_key=True)
+    park_id: int = Field(foreign_key="parks.id", primary_key=True, ondelete="CASCADE")
+    species_id: int = Field(foreign_key="species.species_id", primary_key=True, ondelete="CASCADE")
 
     # Sighting-specific info
     population_estimate: Optional[str] = None  # "50-100 individuals"
     sighting_probability: Optional[str] = None  # "high", "medium", "low"
-    best_spots: Optional[str] = None  # JSON: ["Trail A", "Viewpoint B"]
+    best_spots: Optional[list[str]] = Field(default=None, sa_column=Column(JSON))  # ["Trail A", "Viewpoint B"]
 
     # No relationship() attributes here; they caused SQLAlchemy 2.x errors.
 
@@ -111,7 +116,7 @@ class TrailDB(SQLModel, table=True):
     __tablename__ = "trails"
 
     trail_id: Optional[int] = Field(default=None, primary_key=True)
-    park_id: int = Field(foreign_key="parks.id")
+    park_id: int = Field(foreign_key="parks.id", index=True)
 
     name: str
     description: str
@@ -125,10 +130,10 @@ class TrailDB(SQLModel, table=True):
 
     # GPS data
     gpx_data: Optional[str] = None  # GeoJSON or GPX format
-    waypoints: Optional[str] = None  # JSON array of coordinates
+    waypoints: Optional[list] = Field(default=None, sa_column=Column(JSON))  # array of coordinates
 
     # Features
-    highlights: Optional[str] = None  # JSON: ["waterfall", "viewpoint", "ruins"]
+    highlights: Optional[list[str]] = Field(default=None, sa_column=Column(JSON))  # ["waterfall", "viewpoint", "ruins"]
 
     # Relationship to ParkDB intentionally omitted for compatibility.
 
@@ -137,7 +142,7 @@ class ReviewDB(SQLModel, table=True):
     __tablename__ = "reviews"
 
     review_id: Optional[int] = Field(default=None, primary_key=True)
-    park_id: int = Field(foreign_key="parks.id")
+    park_id: int = Field(foreign_key="parks.id", index=True)
 
     author_name: str
     rating: int  # 1-5 stars
@@ -165,10 +170,12 @@ class BadgeDB(SQLModel, table=True):
 
 class SightingDB(SQLModel, table=True):
     __tablename__ = "sightings"
+    # Also serves park_id-only lookups as the leading column
+    __table_args__ = (Index("ix_sighting_park_species", "park_id", "species_id"),)
 
     sighting_id: Optional[int] = Field(default=None, primary_key=True)
     park_id: int = Field(foreign_key="parks.id")
-    species_id: int = Field(foreign_key="species.species_id")
+    species_id: int = Field(foreign_key="species.species_id", index=True)
 
     reporter_name: str
     sighting_date: str
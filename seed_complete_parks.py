@@ -3,7 +3,7 @@
 #Run with: python seed_complete_parks.py
 
 
-from sqlmodel import Session, select
+from sqlmodel import Session, insert, select
 from database import engine, init_db
 from models import ParkDB, SpeciesDB, ParkSpeciesLink
 from typing import List, Dict
@@ -396,58 +396,74 @@ def seed_complete_database():
     with Session(engine) as session:
         print("=== TUNISIA NATIONAL PARKS COMPLETE DATABASE SEED ===\n")
         
-        # Check existing data
-        existing_parks = session.exec(select(ParkDB)).all()
-        existing_species = session.exec(select(SpeciesDB)).all()
-        
+        # Re-runs only add what is missing: one name lookup per table up
+        # front instead of clearing and re-inserting everything
+        existing_parks = set(session.exec(select(ParkDB.name)).all())
+        existing_species = set(session.exec(select(SpeciesDB.name)).all())
         if existing_parks or existing_species:
-            print(f"⚠️  Database contains {len(existing_parks)} parks and {len(existing_species)} species - clearing and re-seeding...")
-
-            # Clear database
-            for species in existing_species:
-                session.delete(species)
-            for park in existing_parks:
-                session.delete(park)
-            session.commit()
-            print("✓ Database cleared\n")
+            print(f"ℹ️  Database contains {len(existing_parks)} parks and {len(existing_species)} species - adding missing entries only\n")
         
-        # Add all 17 parks
+        # Add the missing parks in one batched INSERT
         print("📍 Adding 17 National Parks...")
-        park_objects = {}
-        for park_data in TUNISIA_PARKS_COMPLETE:
-            # Add required google_maps_url
-            park_data["google_maps_url"] = f"https://www.google.com/maps?q={park_data['latitude']},{park_data['longitude']}"
-            park = ParkDB(**park_data)
-            session.add(park)
-            session.flush()  # Get ID immediately
-            park_objects[park_data["name"]] = park
-            print(f"  ✓ {park.name} ({park.governorate}) - {park.area_km2} km²")
-        
-        session.commit()
-        print(f"\n✅ Added {len(TUNISIA_PARKS_COMPLETE)} national parks\n")
-        
-        # Add all species with complete information
+        park_rows = [
+            {
+                **park_data,
+                # Add required google_maps_url
+                "google_maps_url": f"https://www.google.com/maps?q={park_data['latitude']},{park_data['longitude']}",
+            }
+            for park_data in TUNISIA_PARKS_COMPLETE
+            if park_data["name"] not in existing_parks
+        ]
+        if park_rows:
+            session.execute(insert(ParkDB), park_rows)
+        for park_data in park_rows:
+            print(f"  ✓ {park_data['name']} ({park_data['governorate']}) - {park_data['area_km2']} km²")
+        print(f"\n✅ Added {len(park_rows)} national parks\n")
+
+        # Add all species with complete information, also in one INSERT;
+        # "parks" is a link list, not a column
         print("🦌 Adding Flora & Fauna with Safety Guidelines...")
-        species_count = 0
-        for species_data in SPECIES_DATA:
-            park_names = species_data.pop("parks")
-            
-            species = SpeciesDB(**species_data)
-            session.add(species)
-            session.flush()
-            
-            # Link to parks
-            for park_name_part in park_names:
-                for full_park_name, park_obj in park_objects.items():
-                    if park_name_part.lower() in full_park_name.lower():
-                        link = ParkSpeciesLink(park_id=park_obj.id, species_id=species.species_id)
-                        session.add(link)
-            
-            species_count += 1
-            icon = "🌿" if species.type == "plant" else "🦌"
-            print(f"  {icon} {species.name} ({species.scientific_name})")
-            if hasattr(species, 'medicinal_use') and species.medicinal_use:
+        species_rows = [
+            {key: value for key, value in species_data.items() if key != "parks"}
+            for species_data in SPECIES_DATA
+            if species_data["name"] not in existing_species
+        ]
+        if species_rows:
+            session.execute(insert(SpeciesDB), species_rows)
+        for species_data in species_rows:
+            icon = "🌿" if species_data["type"] == "plant" else "🦌"
+            print(f"  {icon} {species_data['name']} ({species_data['scientific_name']})")
+            if species_data.get("medicinal_use"):
                 print(f"     💊 Medicinal properties documented")
+        species_count = len(species_rows)
+
+        # Link species to parks (matched on a fragment of the park name),
+        # collected first and written with a single executemany
+        seed_park_names = {park_data["name"] for park_data in TUNISIA_PARKS_COMPLETE}
+        park_ids = {
+            name: park_id
+            for name, park_id in session.exec(select(ParkDB.name, ParkDB.id)).all()
+            if name in seed_park_names
+        }
+        species_ids = dict(session.exec(select(SpeciesDB.name, SpeciesDB.species_id)).all())
+        existing_links = set(
+            session.exec(select(ParkSpeciesLink.park_id, ParkSpeciesLink.species_id)).all()
+        )
+        link_pairs = {
+            (park_id, species_ids[species_data["name"]])
+            for species_data in SPECIES_DATA
+            for park_name_part in species_data["parks"]
+            for full_park_name, park_id in park_ids.items()
+            if park_name_part.lower() in full_park_name.lower()
+        } - existing_links
+        if link_pairs:
+            session.execute(
+                insert(ParkSpeciesLink),
+                [
+                    {"park_id": park_id, "species_id": species_id}
+                    for park_id, species_id in sorted(link_pairs)
+                ],
+            )
         
         session.commit()
         print(f"\n✅ Added {species_count} species with complete data\n")
@@ -455,7 +471,7 @@ def seed_complete_database():
         # Summary statistics
         print("📊 DATABASE SUMMARY:")
         print(f"   • Total Parks: 17")
-        print(f"   • Total Species: {species_count}")
+        print(f"   • Total Species: {len(SPECIES_DATA)}")
         print(f"   • Mammals: {sum(1 for s in SPECIES_DATA if s['type'] == 'animal' and 'mammifère' in s.get('description', '').lower() or any(x in s['name'].lower() for x in ['cerf', 'oryx', 'gazelle', 'mouflon', 'chacal', 'sanglier', 'hyène']))}")
         print(f"   • Birds: {sum(1 for s in SPECIES_DATA if s['type'] == 'animal' and any(x in s['name'].lower() for x in ['flamant', 'puffin', 'aigle', 'autruche']))}")
         print(f"   • Flora: {sum(1 for s in SPECIES_DATA if s['type'] == 'plant')}")
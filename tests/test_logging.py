@@ -0,0 +1,23 @@
+import io
+import logging
+
+import main
+
+
+def test_listener_output_has_a_single_prefix():
+    stream = io.StringIO()
+    previous = main._log_stream_handler.setStream(stream)
+    try:
+        main.logger.info("GET %s -> %d", "/api/parks/1", 200)
+        # Stopping the listener drains the queue before returning
+        main._log_listener.stop()
+    finally:
+        main._log_listener.start()
+        main._log_stream_handler.setStream(previous)
+
+    lines = [line for line in stream.getvalue().splitlines() if "/api/parks/1" in line]
+    assert len(lines) == 1
+    line = lines[0]
+    assert line.endswith(" - INFO - tunisia_parks - GET /api/parks/1 -> 200")
+    assert line.count("INFO") == 1
+    assert "tunisia_parks:" not in line
@@ -1,8 +1,8 @@
 import uuid
-import shutil
 from pathlib import Path
 from typing import List
 
+from anyio import open_file, to_thread
 from fastapi import UploadFile, HTTPException
 from PIL import Image
 
@@ -12,6 +12,10 @@ UPLOAD_DIR = Path("uploads")
 PARKS_DIR = UPLOAD_DIR / "parks"
 SPECIES_DIR = UPLOAD_DIR / "species"
 
+# Public URL prefixes for uploaded files (see get_file_url)
+PARKS_URL_PREFIX = "/uploads/parks/"
+SPECIES_URL_PREFIX = "/uploads/species/"
+
 # Create directories if they do not exist
 UPLOAD_DIR.mkdir(exist_ok=True)
 PARKS_DIR.mkdir(exist_ok=True)
@@ -20,6 +24,7 @@ SPECIES_DIR.mkdir(exist_ok=True)
 # Allowed file extensions and max size
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+UPLOAD_CHUNK_SIZE = 64 * 1024  # bytes read per await while streaming uploads
 
 
 def _get_file_extension(filename: str) -> str:
@@ -52,17 +57,33 @@ async def save_upload_file(file: UploadFile, destination: Path) -> str:
     file_path = destination / unique_filename
 
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        optimize_image(file_path)
+        # Stream in bounded chunks so an upload never sits in memory whole
+        # and oversized files are rejected as soon as they cross the limit.
+        # Disk writes and Pillow's re-encode run in worker threads so the
+        # event loop keeps serving other requests meanwhile.
+        total_size = 0
+        async with await open_file(file_path, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                total_size += len(chunk)
+                if total_size > MAX_FILE_SIZE:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large. Maximum size is {MAX_FILE_SIZE // (1024 * 1024)}MB",
+                    )
+                await buffer.write(chunk)
+
+        await to_thread.run_sync(optimize_image, file_path)
         return unique_filename
+    except HTTPException:
+        if file_path.exists():
+            file_path.unlink()
+        raise
     except Exception as e:
         if file_path.exists():
             file_path.unlink()
         raise HTTPException(status_code=500, detail=f"Could not save file: {str(e)}")
     finally:
-        file.file.close()
+        await file.close()
 
 
 def optimize_image(file_path: Path, max_width: int = 1200) -> None:
@@ -1,8 +1,38 @@
 import httpx
 from typing import Optional
+from cachetools import TTLCache
 from config import settings
 
 
+# Weather changes on a minutes-to-hours scale; repeat lookups for the same
+# coordinates are served from memory instead of calling OpenWeatherMap again.
+# Error results are never cached.
+_weather_cache: TTLCache = TTLCache(maxsize=256, ttl=settings.WEATHER_CACHE_TTL)
+_forecast_cache: TTLCache = TTLCache(maxsize=256, ttl=settings.FORECAST_CACHE_TTL)
+
+# One pooled client for the whole process, so cache misses reuse a kept-alive
+# TLS connection to OpenWeatherMap instead of handshaking on every call.
+# Created on first use; the app lifespan closes it on shutdown.
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 async def get_weather_for_location(latitude: float, longitude: float) -> Optional[dict]:
     """
     Get current weather for a location using OpenWeatherMap API
@@ -12,6 +42,11 @@ async def get_weather_for_location(latitude: float, longitude: float) -> Optiona
             "error": "Weather API key not configured",
             "message": "Please configure OPENWEATHER_API_KEY in .env file"
         }
+
+    cache_key = (latitude, longitude)
+    cached = _weather_cache.get(cache_key)
+    if cached is not None:
+        return cached
     
     url = "https://api.openweathermap.org/data/2.5/weather"
     params = {
@@ -23,31 +58,33 @@ async def get_weather_for_location(latitude: float, longitude: float) -> Optiona
     }
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Format the weather data
-            return {
-                "temperature": round(data["main"]["temp"]),
-                "feels_like": round(data["main"]["feels_like"]),
-                "temp_min": round(data["main"]["temp_min"]),
-                "temp_max": round(data["main"]["temp_max"]),
-                "humidity": data["main"]["humidity"],
-                "pressure": data["main"]["pressure"],
-                "description": data["weather"][0]["description"],
-                "icon": data["weather"][0]["icon"],
-                "icon_url": f"https://openweathermap.org/img/wn/{data['weather'][0]['icon']}@2x.png",
-                "wind_speed": round(data["wind"]["speed"] * 3.6, 1),  # Convert m/s to km/h
-                "wind_direction": data["wind"].get("deg", 0),
-                "clouds": data["clouds"]["all"],
-                "visibility": data.get("visibility", 0) / 1000,  # Convert to km
-                "sunrise": data["sys"]["sunrise"],
-                "sunset": data["sys"]["sunset"],
-                "timezone": data["timezone"],
-                "city_name": data.get("name", ""),
-            }
+        client = get_http_client()
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        data = response.json()
+        
+        # Format the weather data
+        weather = {
+            "temperature": round(data["main"]["temp"]),
+            "feels_like": round(data["main"]["feels_like"]),
+            "temp_min": round(data["main"]["temp_min"]),
+            "temp_max": round(data["main"]["temp_max"]),
+            "humidity": data["main"]["humidity"],
+            "pressure": data["main"]["pressure"],
+            "description": data["weather"][0]["description"],
+            "icon": data["weather"][0]["icon"],
+            "icon_url": f"https://openweathermap.org/img/wn/{data['weather'][0]['icon']}@2x.png",
+            "wind_speed": round(data["wind"]["speed"] * 3.6, 1),  # Convert m/s to km/h
+            "wind_direction": data["wind"].get("deg", 0),
+            "clouds": data["clouds"]["all"],
+            "visibility": data.get("visibility", 0) / 1000,  # Convert to km
+            "sunrise": data["sys"]["sunrise"],
+            "sunset": data["sys"]["sunset"],
+            "timezone": data["timezone"],
+            "city_name": data.get("name", ""),
+        }
+        _weather_cache[cache_key] = weather
+        return weather
     except httpx.HTTPError as e:
         return {
             "error": "Failed to fetch weather data",
@@ -68,6 +105,11 @@ async def get_weather_forecast(latitude: float, longitude: float, days: int = 5)
         return {
             "error": "Weather API key not configured"
         }
+
+    cache_key = (latitude, longitude, days)
+    cached = _forecast_cache.get(cache_key)
+    if cached is not None:
+        return cached
     
     url = "https://api.openweathermap.org/data/2.5/forecast"
     params = {
@@ -79,42 +121,44 @@ async def get_weather_forecast(latitude: float, longitude: float, days: int = 5)
     }
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Format forecast data (get one forecast per day at noon)
-            forecasts = []
-            seen_dates = set()
+        client = get_http_client()
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        data = response.json()
+        
+        # Format forecast data (get one forecast per day at noon)
+        forecasts = []
+        seen_dates = set()
+        
+        for item in data["list"]:
+            date = item["dt_txt"].split()[0]
+            hour = item["dt_txt"].split()[1]
             
-            for item in data["list"]:
-                date = item["dt_txt"].split()[0]
-                hour = item["dt_txt"].split()[1]
-                
-                # Get forecast around noon for each day
-                if date not in seen_dates and "12:00:00" in hour:
-                    forecasts.append({
-                        "date": date,
-                        "temperature": round(item["main"]["temp"]),
-                        "temp_min": round(item["main"]["temp_min"]),
-                        "temp_max": round(item["main"]["temp_max"]),
-                        "description": item["weather"][0]["description"],
-                        "icon": item["weather"][0]["icon"],
-                        "icon_url": f"https://openweathermap.org/img/wn/{item['weather'][0]['icon']}@2x.png",
-                        "humidity": item["main"]["humidity"],
-                        "wind_speed": round(item["wind"]["speed"] * 3.6, 1),
-                    })
-                    seen_dates.add(date)
-                
-                if len(forecasts) >= days:
-                    break
+            # Get forecast around noon for each day
+            if date not in seen_dates and "12:00:00" in hour:
+                forecasts.append({
+                    "date": date,
+                    "temperature": round(item["main"]["temp"]),
+                    "temp_min": round(item["main"]["temp_min"]),
+                    "temp_max": round(item["main"]["temp_max"]),
+                    "description": item["weather"][0]["description"],
+                    "icon": item["weather"][0]["icon"],
+                    "icon_url": f"https://openweathermap.org/img/wn/{item['weather'][0]['icon']}@2x.png",
+                    "humidity": item["main"]["humidity"],
+                    "wind_speed": round(item["wind"]["speed"] * 3.6, 1),
+                })
+                seen_dates.add(date)
             
-            return {
-                "city": data["city"]["name"],
-                "country": data["city"]["country"],
-                "forecasts": forecasts
-            }
+            if len(forecasts) >= days:
+                break
+        
+        forecast = {
+            "city": data["city"]["name"],
+            "country": data["city"]["country"],
+            "forecasts": forecasts
+        }
+        _forecast_cache[cache_key] = forecast
+        return forecast
     except Exception as e:
         return {
             "error": "Failed to fetch forecast data",